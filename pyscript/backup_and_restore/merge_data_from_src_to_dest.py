@@ -1,7 +1,13 @@
+import hashlib
 import json
-from datetime import datetime
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime
+from decimal import Decimal
 
 import mysql.connector
+import mysql.connector.pooling
 import yaml
 
 with open ("env_config/application-dev.yml", "r") as file:
@@ -62,54 +68,769 @@ field_mapping = {
     "False": "issue"
 }
 
+def build_row_mapper(column_names, field_mapping):
+    """
+    Builds a function that maps a source row tuple onto the column order of the target table.
+
+    The position of every source column is resolved once from ``column_names`` so rows can be fetched
+    as plain tuples instead of one dict per row.
+
+    Args:
+        column_names (tuple): The column names of the source result set, in row order.
+        field_mapping (dict): Mapping of source field names to target field names.
+
+    Returns:
+        callable: A function taking a source row tuple and returning the tuple of values to insert,
+            ordered like ``field_mapping.values()``.
+    """
+    column_index = {name: index for index, name in enumerate(column_names)}
+    created_index = column_index.get("created_date")
+    getters = []
+
+    for source_field, target_field in field_mapping.items():
+        if source_field in column_index:
+            getters.append(("column", column_index[source_field]))
+        elif target_field == "created_at":
+            getters.append(("created_at", None))
+        elif target_field == "bot_response":
+            getters.append(("json", column_index["query_response"]))
+        elif target_field != "issue":
+            getters.append(("constant", field_mapping.get(target_field)))
+        else:
+            getters.append(("constant", False))
+
+    def map_row(row):
+        created_date = row[created_index] if created_index is not None else None
+        created_at = created_date if created_date else datetime.now()
+
+        return tuple(
+            row[value] if kind == "column" else
+            created_at if kind == "created_at" else
+            json.dumps(row[value]) if kind == "json" else
+            value
+            for kind, value in getters
+        )
+
+    return map_row
+
+
+def field_mapping_hash(field_mapping):
+    """
+    Returns a stable digest of ``field_mapping`` so a saved watermark is only reused with the same mapping.
+    """
+    return hashlib.sha256(json.dumps(field_mapping, sort_keys=True).encode()).hexdigest()
+
+
+def encode_watermark(value):
+    """
+    Converts a watermark value into a JSON serializable ``{"type": ..., "value": ...}`` pair.
+    """
+    if isinstance(value, datetime):
+        return {"type": "datetime", "value": value.isoformat()}
+    if isinstance(value, date):
+        return {"type": "date", "value": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"type": "decimal", "value": str(value)}
+    return {"type": "raw", "value": value}
+
+
+def decode_watermark(encoded):
+    """
+    Reverses ``encode_watermark``.
+    """
+    decoders = {
+        "datetime": datetime.fromisoformat,
+        "date": date.fromisoformat,
+        "decimal": Decimal,
+        "raw": lambda value: value,
+    }
+    return decoders[encoded["type"]](encoded["value"])
+
+
+def load_watermark(state_file, state_key, page_key, field_mapping):
+    """
+    Reads the high-watermark of a previous incremental merge from the state file.
+
+    Args:
+        state_file (str): Path of the JSON state file.
+        state_key (str): The entry of the state file for this source/target pair.
+        page_key (str): The source column the watermark refers to.
+        field_mapping (dict): Mapping of source field names to target field names.
+
+    Returns:
+        The last ``page_key`` value committed by a previous run, or None if there is no usable watermark.
+
+    Note:
+        A watermark saved for a different ``page_key`` or ``field_mapping`` is ignored, so changing the
+        mapping triggers a full rescan instead of silently skipping rows.
+    """
+    if not os.path.exists(state_file):
+        return None
+
+    with open(state_file, "r") as file:
+        entry = json.load(file).get(state_key)
+
+    if not entry:
+        return None
+
+    if entry["page_key"] != page_key or entry["field_mapping_hash"] != field_mapping_hash(field_mapping):
+        print(f"Ignoring watermark for {state_key}: page_key or field_mapping changed since the last run.")
+        return None
+
+    return decode_watermark(entry["watermark"])
+
+
+def save_watermark(state_file, state_key, page_key, field_mapping, watermark):
+    """
+    Atomically records the high-watermark of an incremental merge in the state file.
+
+    Args:
+        state_file (str): Path of the JSON state file.
+        state_key (str): The entry of the state file for this source/target pair.
+        page_key (str): The source column the watermark refers to.
+        field_mapping (dict): Mapping of source field names to target field names.
+        watermark: The last ``page_key`` value whose rows are committed in the target.
+    """
+    state = {}
+    if os.path.exists(state_file):
+        with open(state_file, "r") as file:
+            state = json.load(file)
+
+    state[state_key] = {
+        "page_key": page_key,
+        "watermark": encode_watermark(watermark),
+        "field_mapping_hash": field_mapping_hash(field_mapping),
+        "updated_at": datetime.now().isoformat(),
+    }
+
+    temporary_file = f"{state_file}.tmp"
+    with open(temporary_file, "w") as file:
+        json.dump(state, file, indent=2)
+    os.replace(temporary_file, state_file)
+
+
+def compute_partitions(source_connection, table_name_source, partition_key, partitions):
+    """
+    Splits the source table into disjoint ranges of ``partition_key`` of roughly equal width.
+
+    Args:
+        source_connection (mysql.connector.connection.MySQLConnection): The source database connection.
+        table_name_source (str): The name of the table to split.
+        partition_key (str): A numeric or date/time source column to split on.
+        partitions (int): The number of ranges to produce.
+
+    Returns:
+        list: ``(condition, params)`` pairs, one per partition, that together cover every row exactly once.
+            Rows with a NULL ``partition_key`` fall into the first partition. A single ``None`` entry is
+            returned when the table cannot be split, so every condition parameter is a real bound.
+    """
+    cursor = source_connection.cursor()
+
+    try:
+        cursor.execute(f"SELECT MIN({partition_key}), MAX({partition_key}) FROM {table_name_source}")
+        low, high = cursor.fetchone()
+    finally:
+        cursor.close()
+
+    if partitions <= 1 or low is None or low == high:
+        return [None]
+
+    if isinstance(low, int):
+        bounds = [low + (high - low) * i // partitions for i in range(1, partitions)]
+    else:
+        bounds = [low + (high - low) * i / partitions for i in range(1, partitions)]
+    bounds = sorted(set(bound for bound in bounds if low < bound <= high))
+    # A narrow range (fewer distinct integers than partitions, or a DATE column within one day, where
+    # adding a fraction of a day rounds down) leaves no usable bound to split on.
+    if not bounds:
+        return [None]
+
+    edges = [None] + bounds + [None]
+    ranges = []
+    for lower, upper in zip(edges, edges[1:]):
+        if lower is None:
+            ranges.append((f"({partition_key} < %s OR {partition_key} IS NULL)", (upper,)))
+        elif upper is None:
+            ranges.append((f"{partition_key} >= %s", (lower,)))
+        else:
+            ranges.append((f"{partition_key} >= %s AND {partition_key} < %s", (lower, upper)))
+
+    return ranges
+
+
+def iter_source_pages(source_connection, table_name_source, stream=False, page_size=10000, page_key=None,
+                      partition=None, start_key=None):
+    """
+    Reads the source table as a sequence of pages of row tuples.
+
+    Args:
+        source_connection (mysql.connector.connection.MySQLConnection): The source database connection.
+        table_name_source (str): The name of the table to read from.
+        stream (bool): When False the whole table is fetched as a single page. When True rows are read
+            ``page_size`` at a time so memory use does not grow with the table.
+        page_size (int): The number of rows per page when streaming.
+        page_key (str or None): A source column to paginate on with keyset pagination
+            (``WHERE page_key > last ORDER BY page_key LIMIT page_size``). It should be the primary key or
+            the ``created_date`` dedup column; rows with a NULL ``page_key`` are read in a final pass.
+            When None, a single unbuffered query is drained with ``fetchmany``.
+        partition (tuple or None): A ``(condition, params)`` pair from ``compute_partitions`` restricting
+            which rows are read. When None, the whole table is read.
+        start_key: Only read rows whose ``page_key`` is greater than this value. The NULL ``page_key``
+            pass still runs, since no watermark covers those rows; the ones already copied are skipped by
+            the caller's dedup check.
+
+    Yields:
+        tuple: ``(column_names, rows)`` where ``rows`` is a list of row tuples.
+    """
+    condition, condition_params = partition if partition else ("TRUE", ())
+    cursor = source_connection.cursor()
+
+    try:
+        if not stream:
+            cursor.execute(f"SELECT * FROM {table_name_source} WHERE {condition}", condition_params)
+            rows = cursor.fetchall()
+            yield cursor.column_names, rows
+            return
+
+        if page_key is None:
+            cursor.execute(f"SELECT * FROM {table_name_source} WHERE {condition}", condition_params)
+            while True:
+                rows = cursor.fetchmany(page_size)
+                if not rows:
+                    return
+                yield cursor.column_names, rows
+
+        last_key = start_key
+        while True:
+            if last_key is None:
+                cursor.execute(f"""
+                    SELECT * FROM {table_name_source}
+                    WHERE {page_key} IS NOT NULL AND ({condition})
+                    ORDER BY {page_key} LIMIT %s
+                """, (*condition_params, page_size))
+            else:
+                cursor.execute(f"""
+                    SELECT * FROM {table_name_source}
+                    WHERE {page_key} > %s AND ({condition})
+                    ORDER BY {page_key} LIMIT %s
+                """, (last_key, *condition_params, page_size))
+
+            rows = cursor.fetchall()
+            if not rows:
+                break
+
+            yield cursor.column_names, rows
+            last_key = rows[-1][cursor.column_names.index(page_key)]
+
+        cursor.execute(f"SELECT * FROM {table_name_source} WHERE {page_key} IS NULL AND ({condition})",
+                       condition_params)
+        while True:
+            rows = cursor.fetchmany(page_size)
+            if not rows:
+                return
+            yield cursor.column_names, rows
+
+    finally:
+        cursor.close()
+
+
+def load_existing_keys(target_cursor, table_name_target, key_column, key_range=None):
+    """
+    Loads the dedup keys already present in the target table with a single query.
+
+    Args:
+        target_cursor (mysql.connector.cursor.MySQLCursor): A cursor on the target database.
+        table_name_target (str): The name of the target table.
+        key_column (str): The target column used to detect duplicates.
+        key_range (tuple or None): An inclusive ``(low, high)`` range restricting which keys are loaded.
+            When None, every key in the target table is loaded.
+
+    Returns:
+        set: The distinct, non-null keys found in the target table.
+    """
+    query = f"SELECT DISTINCT {key_column} FROM {table_name_target} WHERE {key_column} IS NOT NULL"
+    params = ()
+
+    if key_range is not None:
+        query += f" AND {key_column} BETWEEN %s AND %s"
+        params = key_range
+
+    target_cursor.execute(query, params)
+    return {key for (key,) in target_cursor}
+
+
+class BatchWriter:
+    """
+    Buffers mapped rows and writes them to the target table in batches.
+
+    Rows are written with ``cursor.executemany``, which mysql-connector rewrites into a single
+    multi-row ``INSERT ... VALUES (...), (...)`` statement per batch. The connection is committed
+    every ``commit_every`` batches so a late failure only rolls back the last few batches and the
+    transaction log stays bounded.
+
+    Args:
+        connection (mysql.connector.connection.MySQLConnection): The target database connection.
+        cursor (mysql.connector.cursor.MySQLCursor): A cursor on the target database.
+        insert_query (str): The parameterized ``INSERT`` statement, built once per run.
+        batch_size (int): The number of rows sent per ``executemany`` call.
+        commit_every (int): The number of batches written between commits.
+    """
+
+    def __init__(self, connection, cursor, insert_query, batch_size=1000, commit_every=10):
+        if batch_size < 1 or commit_every < 1:
+            raise ValueError("batch_size and commit_every must be positive")
+
+        self.connection = connection
+        self.cursor = cursor
+        self.insert_query = insert_query
+        self.batch_size = batch_size
+        self.commit_every = commit_every
+        self.buffer = []
+        self.batches_since_commit = 0
+        self.written = 0
+        self.commits = 0
+
+    def add(self, data_tuple):
+        """
+        Queues a mapped row, writing the buffer once it holds ``batch_size`` rows.
+        """
+        self.buffer.append(data_tuple)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered rows and commits if ``commit_every`` batches have accumulated.
+        """
+        if not self.buffer:
+            return
+
+        self.cursor.executemany(self.insert_query, self.buffer)
+        rows = len(self.buffer)
+        self.buffer = []
+        self.count_batch(rows)
+
+    def count_batch(self, rows):
+        """
+        Records a batch of ``rows`` written on the connection and commits if ``commit_every`` batches have
+        accumulated. Writes made outside the writer, such as a staging insert, are counted with it too.
+        """
+        self.written += rows
+        self.batches_since_commit += 1
+
+        if self.batches_since_commit >= self.commit_every:
+            self.commit()
+
+    def commit(self):
+        """
+        Commits everything written so far.
+        """
+        self.connection.commit()
+        self.batches_since_commit = 0
+        self.commits += 1
+
+    def close(self):
+        """
+        Writes any remaining rows and issues the final commit.
+        """
+        self.flush()
+        self.commit()
+
+
+def insert_missing_via_staging(target_cursor, table_name_target, key_column, columns, rows, batch_size=1000):
+    """
+    Inserts rows that are missing from the target table using a temporary staging table and an anti-join.
+
+    Args:
+        target_cursor (mysql.connector.cursor.MySQLCursor): A cursor on the target database.
+        table_name_target (str): The name of the target table.
+        key_column (str): The target column used to detect duplicates.
+        columns (str): Comma separated list of target columns, in the order of the values in ``rows``.
+        rows (list): The mapped rows to stage.
+        batch_size (int): The number of rows sent per ``executemany`` call while staging.
+
+    Returns:
+        int: The number of rows inserted into the target table.
+
+    Note:
+        The staging table is created with ``CREATE TEMPORARY TABLE ... LIKE`` so it is private to the
+        session and dropped automatically when the connection is closed.
+    """
+    staging_table = f"{table_name_target}_merge_staging"
+    placeholders = ', '.join(['%s'] * len(columns.split(', ')))
+    qualified_columns = ', '.join(f"s.{column}" for column in columns.split(', '))
+
+    target_cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {staging_table}")
+    target_cursor.execute(f"CREATE TEMPORARY TABLE {staging_table} LIKE {table_name_target}")
+    staging_insert = f"INSERT INTO {staging_table} ({columns}) VALUES ({placeholders})"
+    for offset in range(0, len(rows), batch_size):
+        target_cursor.executemany(staging_insert, rows[offset:offset + batch_size])
+    target_cursor.execute(f"""
+        INSERT INTO {table_name_target} ({columns})
+        SELECT {qualified_columns}
+        FROM {staging_table} s
+        LEFT JOIN {table_name_target} t ON t.{key_column} = s.{key_column}
+        WHERE t.{key_column} IS NULL
+    """)
+    inserted = target_cursor.rowcount
+    target_cursor.execute(f"DROP TEMPORARY TABLE {staging_table}")
+
+    return inserted
+
+
+def merge_table(source_connection, target_connection, table_name_source, table_name_target, field_mapping,
+                dedup_mode="per_row", batch_size=1000, commit_every=10, stream=False, page_size=10000,
+                page_key=None, partition=None, start_key=None, on_page_committed=None):
+    """
+    Copies missing rows from the source table to the target table over already open connections.
+
+    Args:
+        source_connection (mysql.connector.connection.MySQLConnection): The source database connection.
+        target_connection (mysql.connector.connection.MySQLConnection): The target database connection.
+        table_name_source (str): The name of the table to read from.
+        table_name_target (str): The name of the table to write to.
+        field_mapping (dict): Mapping of source field names to target field names.
+        dedup_mode (str): See ``transfer_data``.
+        batch_size (int): The number of rows written per ``executemany`` call.
+        commit_every (int): The number of batches written between commits. In staging mode each page
+            counts as one batch.
+        stream (bool): See ``iter_source_pages``.
+        page_size (int): See ``iter_source_pages``.
+        page_key (str or None): See ``iter_source_pages``.
+        partition (tuple or None): See ``iter_source_pages``.
+        start_key: See ``iter_source_pages``.
+        on_page_committed (callable or None): Called with the last ``page_key`` value of each keyset page
+            once that page is committed. Setting it commits at every page boundary.
+
+    Returns:
+        dict: Counts of rows read, inserted and skipped, the number of commits and per-phase timings in seconds.
+
+    Raises:
+        mysql.connector.Error: If an error occurs while reading from or writing to either database.
+    """
+    merge_start = time.perf_counter()
+    stats = {"read": 0, "inserted": 0, "skipped": 0, "commits": 0, "timings": {}}
+    timings = stats["timings"]
+    key_column = field_mapping['created_date']
+    columns = ', '.join(field_mapping.values())
+    placeholders = ', '.join(['%s'] * len(field_mapping))
+    insert_query = f"INSERT INTO {table_name_target} ({columns}) VALUES ({placeholders})"
+
+    def add_timing(phase, phase_start):
+        timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - phase_start
+
+    target_cursor = target_connection.cursor()
+    writer = BatchWriter(target_connection, target_cursor, insert_query, batch_size, commit_every)
+    pages = iter_source_pages(source_connection, table_name_source, stream, page_size, page_key, partition,
+                              start_key)
+    map_row = None
+    pending_keys = set()
+
+    try:
+        while True:
+            phase_start = time.perf_counter()
+            page = next(pages, None)
+            add_timing("read", phase_start)
+            if page is None:
+                break
+
+            column_names, rows = page
+            stats["read"] += len(rows)
+            if map_row is None:
+                map_row = build_row_mapper(column_names, field_mapping)
+            key_index = column_names.index("created_date") if "created_date" in column_names else None
+
+            def row_key(row):
+                return row[key_index] if key_index is not None else None
+
+            if dedup_mode == "per_row":
+                phase_start = time.perf_counter()
+                for row in rows:
+                    key = row_key(row)
+                    if not writer.buffer:
+                        pending_keys.clear()
+                    if key is not None and key in pending_keys:
+                        stats["skipped"] += 1
+                        continue
+
+                    target_cursor.execute(f"""
+                        SELECT COUNT(*) 
+                        FROM {table_name_target}
+                        WHERE {key_column} = %s
+                    """, (key,))
+
+                    row_count = target_cursor.fetchone()[0]
+
+                    if row_count == 0:
+                        writer.add(map_row(row))
+                        if key is not None:
+                            pending_keys.add(key)
+                        stats["inserted"] += 1
+                    else:
+                        stats["skipped"] += 1
+                add_timing("dedup_and_insert", phase_start)
+
+            elif dedup_mode == "preload":
+                phase_start = time.perf_counter()
+                writer.flush()
+                source_keys = [key for key in map(row_key, rows) if key is not None]
+                key_range = (min(source_keys), max(source_keys)) if source_keys else None
+                existing_keys = load_existing_keys(target_cursor, table_name_target, key_column, key_range) \
+                    if key_range else set()
+                add_timing("load_keys", phase_start)
+
+                phase_start = time.perf_counter()
+                missing_rows = []
+                for row in rows:
+                    key = row_key(row)
+                    if key is not None and key in existing_keys:
+                        stats["skipped"] += 1
+                        continue
+                    if key is not None:
+                        existing_keys.add(key)
+                    missing_rows.append(map_row(row))
+                add_timing("dedup", phase_start)
+
+                phase_start = time.perf_counter()
+                for data_tuple in missing_rows:
+                    writer.add(data_tuple)
+                writer.flush()
+                stats["inserted"] += len(missing_rows)
+                add_timing("insert", phase_start)
+
+            else:
+                phase_start = time.perf_counter()
+                staged_rows = []
+                seen_keys = set()
+                for row in rows:
+                    key = row_key(row)
+                    if key is not None and key in seen_keys:
+                        continue
+                    if key is not None:
+                        seen_keys.add(key)
+                    staged_rows.append(map_row(row))
+                add_timing("map", phase_start)
+
+                phase_start = time.perf_counter()
+                inserted = 0
+                if staged_rows:
+                    inserted = insert_missing_via_staging(
+                        target_cursor, table_name_target, key_column, columns, staged_rows, batch_size
+                    )
+                    writer.count_batch(inserted)
+                stats["inserted"] += inserted
+                stats["skipped"] += len(rows) - inserted
+                add_timing("stage_and_insert", phase_start)
+
+            if on_page_committed and page_key in column_names:
+                last_key = rows[-1][column_names.index(page_key)]
+                if last_key is not None:
+                    phase_start = time.perf_counter()
+                    writer.flush()
+                    writer.commit()
+                    on_page_committed(last_key)
+                    add_timing("checkpoint", phase_start)
+
+        phase_start = time.perf_counter()
+        writer.close()
+        stats["commits"] = writer.commits
+        add_timing("commit", phase_start)
+        stats["elapsed"] = time.perf_counter() - merge_start
+
+        return stats
+
+    finally:
+        pages.close()
+        target_cursor.close()
+
+
+def transfer_partitions(source_pool, target_pool, table_name_source, table_name_target, field_mapping,
+                        partitions, workers, **merge_options):
+    """
+    Merges each partition of the source table on its own pooled connection pair, ``workers`` at a time.
+
+    Args:
+        source_pool (mysql.connector.pooling.MySQLConnectionPool): Pool of source database connections.
+        target_pool (mysql.connector.pooling.MySQLConnectionPool): Pool of target database connections.
+        table_name_source (str): The name of the table to read from.
+        table_name_target (str): The name of the table to write to.
+        field_mapping (dict): Mapping of source field names to target field names.
+        partitions (list): ``(condition, params)`` pairs from ``compute_partitions``.
+        workers (int): The maximum number of partitions merged concurrently.
+        **merge_options: Extra keyword arguments forwarded to ``merge_table``.
+
+    Returns:
+        dict: The summed counts of every partition, the wall-clock ``elapsed`` time and the per-partition
+            stats under ``partitions``.
+
+    Raises:
+        mysql.connector.Error: If any partition fails. Partitions already committed stay in the target.
+    """
+    def merge_partition(partition):
+        source_connection = source_pool.get_connection()
+        target_connection = target_pool.get_connection()
+        try:
+            return merge_table(source_connection, target_connection, table_name_source, table_name_target,
+                               field_mapping, partition=partition, **merge_options)
+        finally:
+            source_connection.close()
+            target_connection.close()
+
+    run_start = time.perf_counter()
+    totals = {"read": 0, "inserted": 0, "skipped": 0, "commits": 0, "partitions": []}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(merge_partition, partition): index for index, partition in enumerate(partitions)}
+
+        for future in as_completed(futures):
+            index = futures[future]
+            partition_stats = future.result()
+            partition_stats["partition"] = index
+            totals["partitions"].append(partition_stats)
+            for counter in ("read", "inserted", "skipped", "commits"):
+                totals[counter] += partition_stats[counter]
+
+            elapsed = partition_stats["elapsed"]
+            rows_per_second = partition_stats["read"] / elapsed if elapsed else 0.0
+            print(f"Partition {index + 1}/{len(partitions)} done: read {partition_stats['read']}, "
+                  f"inserted {partition_stats['inserted']}, skipped {partition_stats['skipped']} "
+                  f"in {elapsed:.3f}s ({rows_per_second:.0f} rows/s)")
+
+    totals["partitions"].sort(key=lambda partition_stats: partition_stats["partition"])
+    totals["elapsed"] = time.perf_counter() - run_start
+
+    return totals
+
+
 def transfer_data(source_host, source_user, source_password, source_database, source_port,
                   target_host, target_user, target_password, target_database, target_port,
-                  table_name_source, table_name_target, field_mapping):
-    
+                  table_name_source, table_name_target, field_mapping, dedup_mode="per_row",
+                  batch_size=1000, commit_every=10, stream=False, page_size=10000, page_key=None,
+                  workers=1, partition_key="created_date", state_file=None):
+    """
+    Copies rows from a source table into a target table, skipping rows whose ``created_date`` already exists.
+
+    Args:
+        source_host (str): The hostname or IP address of the source MySQL server.
+        source_user (str): The username for accessing the source MySQL database.
+        source_password (str): The password for the specified source MySQL user.
+        source_database (str): The name of the source MySQL database.
+        source_port (str): The port number on which the source MySQL server is listening.
+        target_host (str): The hostname or IP address of the target MySQL server.
+        target_user (str): The username for accessing the target MySQL database.
+        target_password (str): The password for the specified target MySQL user.
+        target_database (str): The name of the target MySQL database.
+        target_port (str): The port number on which the target MySQL server is listening.
+        table_name_source (str): The name of the table to read from.
+        table_name_target (str): The name of the table to write to.
+        field_mapping (dict): Mapping of source field names to target field names.
+        dedup_mode (str): How already-present rows are detected:
+            - "per_row": one ``SELECT COUNT(*)`` against the target for every source row.
+            - "preload": load the target keys within each page's key range once and check them in memory.
+            - "staging": stage each page of mapped rows in a temporary table and insert the missing ones
+              with an anti-join. Each page counts as one batch towards ``commit_every``.
+        batch_size (int): The number of rows written per ``executemany`` call.
+        commit_every (int): The number of batches written between commits.
+        stream (bool): Read the source ``page_size`` rows at a time instead of fetching the whole table.
+        page_size (int): The number of source rows per page when streaming.
+        page_key (str or None): The source column used for keyset pagination when streaming.
+            When None, a single unbuffered query is drained with ``fetchmany``.
+        workers (int): The number of partitions merged concurrently, each on its own connection pair.
+        partition_key (str): The numeric or date/time source column used to split the table when
+            ``workers`` is greater than 1.
+        state_file (str or None): Path of a JSON state file enabling incremental mode. The source is
+            streamed by ``page_key`` starting after the watermark saved by the previous run, and the
+            watermark is saved again after every committed page, so a crashed run resumes where it stopped.
+            Rows with a NULL ``page_key`` are not covered by the watermark and are read again on every run.
+
+    Returns:
+        dict or None: Counts of rows read, inserted and skipped along with per-phase timings in seconds
+            (per-partition stats when ``workers`` is greater than 1), or None if either connection could
+            not be established or the transfer failed.
+
+    Raises:
+        ValueError: If ``dedup_mode`` is not one of the supported modes, or if incremental mode is
+            requested without a ``page_key`` or together with ``workers`` greater than 1.
+
+    Note:
+        Inserts are committed every ``commit_every`` batches, so if the run fails part way the rows
+        from earlier commits stay in the target. Re-running is safe because those rows are skipped
+        by the dedup check.
+
+        With ``workers`` greater than 1, partition on ``created_date`` so that rows sharing a dedup key
+        always land in the same partition; partitioning on any other column lets two workers insert the
+        same key concurrently. Workers are threads: the time goes into database round trips, during which
+        mysql-connector releases the GIL.
+    """
+    if dedup_mode not in ("per_row", "preload", "staging"):
+        raise ValueError(f"Unsupported dedup_mode: {dedup_mode}")
+
+    if state_file and (page_key is None or workers > 1):
+        raise ValueError("Incremental mode needs a page_key and a single worker")
+
     source_connection = connect_to_database(source_host, source_user, source_password, source_database, source_port)
     target_connection = connect_to_database(target_host, target_user, target_password, target_database, target_port)
 
-    if source_connection and target_connection:
+    if source_connection and target_connection and workers > 1:
         try:
-            source_cursor = source_connection.cursor(dictionary=True)
-            target_cursor = target_connection.cursor()
-
-            fields_for_check = (field_mapping['created_date'],)
-            placeholders = ', '.join(['%s'] * len(fields_for_check))
-
-            source_cursor.execute(f"SELECT * FROM {table_name_source}")
-            rows = source_cursor.fetchall()
-
-            for row in rows:
-                target_cursor.execute(f"""
-                    SELECT COUNT(*) 
-                    FROM {table_name_target}
-                    WHERE {field_mapping['created_date']} = %s
-                """, (row.get('created_date', None),))
-
-                row_count = target_cursor.fetchone()[0]
-
-                if row_count == 0:
-                    created_date = row.get("created_date")
-                    created_at = created_date if created_date else datetime.now()
-
-                    columns = ', '.join(field_mapping.values())
-                    placeholders = ', '.join(['%s'] * len(field_mapping))
-                    insert_query = f"INSERT INTO {table_name_target} ({columns}) VALUES ({placeholders})"
-
-                    data_tuple = tuple(
-                        row[source_field] if source_field in row else
-                        created_at if target_field == "created_at" else
-                        json.dumps(row["query_response"]) if target_field == "bot_response" else
-                        field_mapping.get(target_field) if target_field != "issue" else
-                        False
-                        for source_field, target_field in field_mapping.items()
-                    )
+            partitions = compute_partitions(source_connection, table_name_source, partition_key, workers)
+        finally:
+            source_connection.close()
+            target_connection.close()
+
+        try:
+            source_pool = mysql.connector.pooling.MySQLConnectionPool(
+                pool_name=f"merge_source_{table_name_source}", pool_size=workers, host=source_host,
+                user=source_user, password=source_password, database=source_database, port=source_port
+            )
+            target_pool = mysql.connector.pooling.MySQLConnectionPool(
+                pool_name=f"merge_target_{table_name_target}", pool_size=workers, host=target_host,
+                user=target_user, password=target_password, database=target_database, port=target_port
+            )
+            stats = transfer_partitions(source_pool, target_pool, table_name_source, table_name_target,
+                                        field_mapping, partitions, workers, dedup_mode=dedup_mode,
+                                        batch_size=batch_size, commit_every=commit_every, stream=stream,
+                                        page_size=page_size, page_key=page_key)
+
+            rows_per_second = stats["read"] / stats["elapsed"] if stats["elapsed"] else 0.0
+            print(f"Data transferred from {table_name_source} to {table_name_target} successfully "
+                  f"using {workers} workers over {len(partitions)} partitions.")
+            print(f"Rows read: {stats['read']}, inserted: {stats['inserted']}, skipped: {stats['skipped']}, "
+                  f"commits: {stats['commits']} in {stats['elapsed']:.3f}s ({rows_per_second:.0f} rows/s)")
+
+            return stats
+
+        except mysql.connector.Error as err:
+            print("An error occurred:", err)
 
-                    target_cursor.execute(insert_query, data_tuple)
+    elif source_connection and target_connection:
+        try:
+            start_key = None
+            on_page_committed = None
+
+            if state_file:
+                state_key = f"{source_database}.{table_name_source}->{target_database}.{table_name_target}"
+                start_key = load_watermark(state_file, state_key, page_key, field_mapping)
+                stream = True
+                print(f"Resuming {state_key} after {page_key} = {start_key}" if start_key is not None else
+                      f"No watermark for {state_key}, starting from the beginning")
+
+                def save_page_watermark(watermark):
+                    save_watermark(state_file, state_key, page_key, field_mapping, watermark)
+
+                on_page_committed = save_page_watermark
+
+            stats = merge_table(source_connection, target_connection, table_name_source, table_name_target,
+                                field_mapping, dedup_mode, batch_size, commit_every, stream, page_size, page_key,
+                                start_key=start_key, on_page_committed=on_page_committed)
 
-            target_connection.commit()
             print(f"Data transferred from {table_name_source} to {table_name_target} successfully.")
+            print(f"Rows read: {stats['read']}, inserted: {stats['inserted']}, skipped: {stats['skipped']}, "
+                  f"commits: {stats['commits']}")
+            for phase, seconds in stats["timings"].items():
+                print(f"  {phase}: {seconds:.3f}s")
+
+            return stats
 
         except mysql.connector.Error as err:
             print("An error occurred:", err)
@@ -117,8 +838,6 @@ def transfer_data(source_host, source_user, source_password, source_database, so
         finally:
             source_connection.close()
             target_connection.close()
-            source_cursor.close()
-            target_cursor.close()
 
 
 source_host = config['datasource']["SOURCE_DATABASE_HOST"]
@@ -133,7 +852,17 @@ target_password = config['datasource']["DATABASE_PASS"]
 target_database = config['datasource']["DATABASE_NAME"]
 target_port = config['datasource']["DATABASE_PORT"]
 
+merge_config = config.get('merge', {})
 
 transfer_data(source_host, source_user, source_password, source_database, source_port,
               target_host, target_user, target_password, target_database, target_port,
-              'source_table', 'destination_table', field_mapping)
\ No newline at end of file
+              'source_table', 'destination_table', field_mapping,
+              dedup_mode=merge_config.get('DEDUP_MODE', 'per_row'),
+              batch_size=merge_config.get('BATCH_SIZE', 1000),
+              commit_every=merge_config.get('COMMIT_EVERY', 10),
+              stream=merge_config.get('STREAM', False),
+              page_size=merge_config.get('PAGE_SIZE', 10000),
+              page_key=merge_config.get('PAGE_KEY'),
+              workers=merge_config.get('WORKERS', 1),
+              partition_key=merge_config.get('PARTITION_KEY', 'created_date'),
+              state_file=merge_config.get('STATE_FILE'))
\ No newline at end of file
@@ -1,9 +1,23 @@
+import gzip
+import hashlib
+import io
+import json
 import os
+import re
 import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 
 import mysql.connector
 import yaml
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 with open ("env_config/application-dev.yml", "r") as file:
     config = yaml.safe_load(file)
 
@@ -87,7 +101,286 @@ def dump_data(source_host, source_user, source_password, source_database, source
             connection.close()
 
 
-def restore_data(target_host, target_user, target_password, target_database, target_port, table_name, dump_file):
+SQL_SPECIAL_CHARS = re.compile(r"[;'\"`#/-]")
+SQL_QUOTE_PATTERNS = {"'": re.compile(r"['\\]"), '"': re.compile(r'["\\]'), "`": re.compile("`")}
+SQL_INSERT_VALUES = re.compile(r"^\s*(INSERT\s+(?:IGNORE\s+)?INTO\s+.+?\s+VALUES\s*)\(", re.IGNORECASE | re.DOTALL)
+SQL_TUPLE_CHARS = re.compile(r"[()'\"\\]")
+SQL_STRING_LITERALS = re.compile(r"'[^'\\]*(?:\\.[^'\\]*)*'|\"[^\"\\]*(?:\\.[^\"\\]*)*\"", re.DOTALL)
+SQL_ROW_SEPARATOR = re.compile(r"\)\s*,\s*\(")
+
+
+def open_dump_file(dump_file):
+    """
+    Opens a SQL dump file for reading as text, transparently decompressing gzip and zstd files.
+
+    Args:
+        dump_file (str): The filename of the SQL dump, optionally gzip or zstd compressed.
+
+    Returns:
+        io.TextIOBase: A text stream over the dump file.
+
+    Raises:
+        ValueError: If the dump is zstd compressed and the zstandard package is not installed.
+    """
+    with open(dump_file, 'rb') as f:
+        magic = f.read(4)
+
+    if magic[:2] == b'\x1f\x8b':
+        return gzip.open(dump_file, 'rt', encoding='utf-8')
+    if magic == b'\x28\xb5\x2f\xfd':
+        if zstandard is None:
+            raise ValueError("Reading zstd dumps requires the zstandard package")
+        reader = zstandard.ZstdDecompressor().stream_reader(open(dump_file, 'rb'))
+        return io.TextIOWrapper(reader, encoding='utf-8')
+    return open(dump_file, 'r', encoding='utf-8')
+
+
+def iter_sql_statements(stream, chunk_size=1024 * 1024):
+    """
+    Yields the SQL statements of a dump one at a time while reading it in fixed-size chunks.
+
+    Args:
+        stream (io.TextIOBase): A text stream over the SQL dump.
+        chunk_size (int): The number of characters read per chunk.
+
+    Yields:
+        str: Each statement without its terminating semicolon.
+
+    Note:
+        Semicolons inside quoted strings, quoted identifiers, ``--``/``#`` line comments and ``/* */``
+        block comments do not end a statement. Backslash escapes and doubled quotes inside strings are
+        honoured. Comments are kept in the statement text, since the ``/*!...*/`` comments written by
+        mysqldump are executed by the server; statements made only of comments and whitespace are dropped.
+    """
+    pending = ''
+    start = 0
+    scan = 0
+    state = None
+    has_content = False
+    eof = False
+
+    while True:
+        if not eof:
+            chunk = stream.read(chunk_size)
+            if chunk:
+                # Statements already yielded are dropped once per chunk rather than after every statement.
+                pending = pending[start:] + chunk
+                scan -= start
+                start = 0
+            else:
+                eof = True
+
+        while scan < len(pending):
+            if state is None:
+                match = SQL_SPECIAL_CHARS.search(pending, scan)
+                end = match.start() if match else len(pending)
+                if not has_content and pending[scan:end].strip():
+                    has_content = True
+                if not match:
+                    scan = len(pending)
+                    break
+
+                index = match.start()
+                char = pending[index]
+                following = pending[index + 1:index + 3]
+
+                if char == ';':
+                    if has_content:
+                        yield pending[start:index]
+                    start = index + 1
+                    scan = start
+                    has_content = False
+                elif char in "'\"`":
+                    state = char
+                    has_content = True
+                    scan = index + 1
+                elif char == '#':
+                    state = '#'
+                    scan = index + 1
+                elif char == '-' or char == '/':
+                    if len(following) < 2 and not eof:
+                        scan = index
+                        break
+                    if char == '-' and following[:1] == '-' and (len(following) < 2 or following[1].isspace()):
+                        state = '#'
+                        scan = index + 2
+                    elif char == '/' and following[:1] == '*':
+                        state = '*'
+                        has_content = has_content or following[1:2] == '!'
+                        scan = index + 2
+                    else:
+                        has_content = True
+                        scan = index + 1
+
+            elif state == '#':
+                index = pending.find('\n', scan)
+                if index == -1:
+                    scan = len(pending)
+                    break
+                state = None
+                scan = index + 1
+
+            elif state == '*':
+                index = pending.find('*/', scan)
+                if index == -1:
+                    scan = max(scan, len(pending) - 1)
+                    break
+                state = None
+                scan = index + 2
+
+            else:
+                match = SQL_QUOTE_PATTERNS[state].search(pending, scan)
+                if not match:
+                    scan = len(pending)
+                    break
+
+                index = match.start()
+                if index + 1 >= len(pending) and not eof:
+                    scan = index
+                    break
+                if pending[index] == '\\':
+                    scan = index + 2
+                elif pending[index + 1:index + 2] == state:
+                    scan = index + 2
+                else:
+                    state = None
+                    scan = index + 1
+
+        if eof:
+            if has_content and pending[start:].strip():
+                yield pending[start:]
+            return
+
+
+def split_extended_insert(statement, max_bytes):
+    """
+    Splits an extended ``INSERT ... VALUES (...), (...)`` statement into statements of at most ``max_bytes``.
+
+    Args:
+        statement (str): The SQL statement to split.
+        max_bytes (int): The maximum encoded size of each resulting statement.
+
+    Returns:
+        list: The statements to execute in order. Statements that already fit, that are not extended
+            inserts, or whose single rows exceed ``max_bytes`` are returned unchanged.
+    """
+    if len(statement.encode('utf-8')) <= max_bytes:
+        return [statement]
+
+    match = SQL_INSERT_VALUES.match(statement)
+    if not match:
+        return [statement]
+
+    prefix = match.group(1)
+    prefix_bytes = len(prefix.encode('utf-8'))
+    statements = []
+    batch = []
+    batch_bytes = prefix_bytes
+    position = match.end() - 1
+    depth = 0
+    quote = None
+    tuple_start = position
+
+    while True:
+        match = SQL_TUPLE_CHARS.search(statement, position)
+        if not match:
+            break
+
+        index = match.start()
+        char = statement[index]
+        position = index + 1
+
+        if quote:
+            if char == '\\':
+                position = index + 2
+            elif char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == '(':
+            if depth == 0:
+                tuple_start = index
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                row = statement[tuple_start:index + 1]
+                row_bytes = len(row.encode('utf-8')) + 1
+                if batch and batch_bytes + row_bytes > max_bytes:
+                    statements.append(prefix + ','.join(batch))
+                    batch = []
+                    batch_bytes = prefix_bytes
+                batch.append(row)
+                batch_bytes += row_bytes
+
+    if batch:
+        statements.append(prefix + ','.join(batch))
+
+    return statements
+
+
+def count_insert_rows(statement):
+    """
+    Counts the rows of an extended ``INSERT ... VALUES (...), (...)`` statement.
+
+    Args:
+        statement (str): The SQL statement to count.
+
+    Returns:
+        int: The number of rows, or 0 for statements that are not inserts.
+
+    Note:
+        String literals are removed before the separators between rows are counted, so the count is
+        exact for the literal rows mysqldump writes without scanning the statement in Python.
+    """
+    match = SQL_INSERT_VALUES.match(statement)
+    if not match:
+        return 0
+
+    values = SQL_STRING_LITERALS.sub('', statement[match.end() - 1:])
+    return len(SQL_ROW_SEPARATOR.findall(values)) + 1
+
+
+def execute_sql_stream(cursor, stream, chunk_size=1024 * 1024, count_rows=False):
+    """
+    Executes every statement of a SQL dump stream on the given cursor.
+
+    Args:
+        cursor (mysql.connector.cursor.MySQLCursor): A cursor on the target database.
+        stream (io.TextIOBase): A text stream over the SQL dump.
+        chunk_size (int): The number of characters read from the stream at a time.
+        count_rows (bool): Also count the rows of the ``INSERT`` statements read from the stream.
+
+    Returns:
+        dict: The number of ``statements`` executed, the ``rows`` they affected, the UTF-8 encoded
+            ``bytes`` of SQL sent and the ``execute_seconds`` spent waiting on the server. With
+            ``count_rows``, also the ``rows_read`` from the stream.
+
+    Raises:
+        mysql.connector.Error: If a statement fails.
+    """
+    cursor.execute("SELECT @@max_allowed_packet")
+    max_statement_bytes = cursor.fetchone()[0] - 1024
+    stats = {"statements": 0, "rows": 0, "bytes": 0, "execute_seconds": 0.0}
+    if count_rows:
+        stats["rows_read"] = 0
+
+    for sql_statement in iter_sql_statements(stream, chunk_size):
+        if count_rows:
+            stats["rows_read"] += count_insert_rows(sql_statement)
+        for statement in split_extended_insert(sql_statement, max_statement_bytes):
+            execute_start = time.perf_counter()
+            cursor.execute(statement)
+            stats["execute_seconds"] += time.perf_counter() - execute_start
+            stats["statements"] += 1
+            stats["rows"] += max(cursor.rowcount, 0)
+            stats["bytes"] += len(statement.encode('utf-8'))
+
+    return stats
+
+
+def restore_data(target_host, target_user, target_password, target_database, target_port, table_name, dump_file,
+                 chunk_size=1024 * 1024):
     """
     Restores data from a SQL dump file to a specified table in a MySQL database.
 
@@ -98,7 +391,9 @@ def restore_data(target_host, target_user, target_password, target_database, tar
         target_database (str): The name of the target MySQL database where data will be restored.
         target_port (str): The port number on which the target MySQL server is listening.
         table_name (str): The name of the table where data will be restored.
-        dump_file (str): The filename of the SQL dump file from which data will be restored.
+        dump_file (str): The filename of the SQL dump file from which data will be restored. Gzip compressed
+            dumps are detected and decompressed on the fly.
+        chunk_size (int): The number of characters read from the dump file at a time.
 
     Returns:
         None
@@ -109,7 +404,9 @@ def restore_data(target_host, target_user, target_password, target_database, tar
 
     Note:
         This function restores data from a SQL dump file to a specified table in the target MySQL database.
-        It reads SQL statements from the dump file, executes them using a cursor, and commits the changes.
+        It streams SQL statements from the dump file with ``iter_sql_statements``, so memory use is bounded by
+        the largest statement rather than the dump size. Extended inserts larger than the server's
+        ``max_allowed_packet`` are split into several smaller inserts before they are executed.
         After the restore process is completed, the function closes the database connection and removes the dump file.
     """
     connection = connect_to_database(target_host, target_user, target_password, target_database, target_port)
@@ -118,12 +415,8 @@ def restore_data(target_host, target_user, target_password, target_database, tar
         try:
             cursor = connection.cursor()
 
-            with open(dump_file, 'r') as f:
-                sql_statements = f.read()
-
-                for sql_statement in sql_statements.split(';'):
-                    if sql_statement.strip():
-                        cursor.execute(sql_statement)
+            with open_dump_file(dump_file) as f:
+                execute_sql_stream(cursor, f, chunk_size)
 
             connection.commit()
             print(f"Data restored from {dump_file} to {target_database}.{table_name} successfully.")
@@ -139,6 +432,533 @@ def restore_data(target_host, target_user, target_password, target_database, tar
                 os.remove(dump_file)
 
 
+class CountingReader(io.RawIOBase):
+    """
+    A raw binary stream that counts the bytes read through it.
+
+    Args:
+        raw (io.BufferedIOBase): The underlying binary stream, such as a subprocess stdout.
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = self.raw.readinto(buffer)
+        self.bytes_read += size or 0
+        return size
+
+
+class CopyingReader(CountingReader):
+    """
+    A raw binary stream that counts the bytes read through it and writes a copy of them to another stream.
+
+    Args:
+        raw (io.BufferedIOBase): The underlying binary stream, such as a subprocess stdout.
+        sink (io.IOBase): The binary stream every byte read is written to, such as a compressor.
+    """
+
+    def __init__(self, raw, sink):
+        super().__init__(raw)
+        self.sink = sink
+
+    def readinto(self, buffer):
+        size = super().readinto(buffer)
+        if size:
+            self.sink.write(buffer[:size])
+        return size
+
+
+def write_client_option_file(user, password):
+    """
+    Writes the MySQL client credentials to a private option file so they never appear on a command line.
+
+    Args:
+        user (str): The MySQL username.
+        password (str): The password for the specified user.
+
+    Returns:
+        str: The path of the option file, readable only by the current user. The caller removes it.
+    """
+    def quote(value):
+        return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+    fd, option_file = tempfile.mkstemp(suffix='.cnf')
+    with os.fdopen(fd, 'w') as f:
+        f.write(f"[client]\nuser={quote(user)}\npassword={quote(password)}\n")
+
+    return option_file
+
+
+def build_dump_command(option_file, source_host, source_port, source_database, table_names):
+    """
+    Builds the mysqldump argument list for a set of tables.
+
+    Args:
+        option_file (str): Path of the client option file from ``write_client_option_file``.
+        source_host (str): The hostname or IP address of the source MySQL server.
+        source_port (str): The port number on which the source MySQL server is listening.
+        source_database (str): The name of the source MySQL database.
+        table_names (list): The tables to dump.
+
+    Returns:
+        list: The command to pass to ``subprocess`` without a shell.
+    """
+    return [
+        "mysqldump", f"--defaults-extra-file={option_file}",
+        f"--host={source_host}", f"--port={source_port}",
+        "--single-transaction", "--skip-lock-tables",
+        source_database, *table_names,
+    ]
+
+
+def pipe_data(source_host, source_user, source_password, source_database, source_port,
+              target_host, target_user, target_password, target_database, target_port, table_name,
+              chunk_size=1024 * 1024):
+    """
+    Streams a mysqldump of a table straight into the target database without writing it to disk.
+
+    Args:
+        source_host (str): The hostname or IP address of the source MySQL server.
+        source_user (str): The username for accessing the source MySQL database.
+        source_password (str): The password for the specified source MySQL user.
+        source_database (str): The name of the source MySQL database containing the table to copy.
+        source_port (str): The port number on which the source MySQL server is listening.
+        target_host (str): The hostname or IP address of the target MySQL server.
+        target_user (str): The username for accessing the target MySQL database.
+        target_password (str): The password for the specified target MySQL user.
+        target_database (str): The name of the target MySQL database where data will be restored.
+        target_port (str): The port number on which the target MySQL server is listening.
+        table_name (str): The name of the table to copy.
+        chunk_size (int): The number of characters read from the dump pipe at a time.
+
+    Returns:
+        dict or None: Throughput figures for the ``dump`` and ``restore`` stages, or None if the copy failed.
+            The dump stage counts the bytes and ``INSERT`` rows read from mysqldump over the whole run;
+            the restore stage counts the rows affected and UTF-8 bytes sent over the time spent executing.
+
+    Raises:
+        mysql.connector.Error: If an error occurs during the MySQL connection or execution of SQL statements.
+        subprocess.CalledProcessError: If mysqldump exits with a non-zero status.
+
+    Note:
+        mysqldump runs as a subprocess without a shell, with the credentials passed through a private
+        option file. Its stdout is parsed with ``iter_sql_statements`` while it is still being produced,
+        so the dump and restore overlap. The copy is not atomic: the ``DROP TABLE``, ``CREATE TABLE``,
+        ``LOCK TABLES``, ``ALTER TABLE`` and ``UNLOCK TABLES`` statements mysqldump writes each commit
+        implicitly, so only the inserts since the last of them are rolled back when mysqldump or a statement
+        fails. The target table can then be left dropped, empty or partially filled, and the copy should be
+        run again.
+    """
+    connection = connect_to_database(target_host, target_user, target_password, target_database, target_port)
+
+    if connection:
+        option_file = write_client_option_file(source_user, source_password)
+        process = None
+
+        try:
+            cursor = connection.cursor()
+            command = build_dump_command(option_file, source_host, source_port, source_database, [table_name])
+            start = time.perf_counter()
+            process = subprocess.Popen(command, stdout=subprocess.PIPE)
+            counter = CountingReader(process.stdout)
+
+            with io.TextIOWrapper(io.BufferedReader(counter), encoding='utf-8') as stream:
+                restore_stats = execute_sql_stream(cursor, stream, chunk_size, count_rows=True)
+
+            return_code = process.wait()
+            elapsed = time.perf_counter() - start
+            if return_code != 0:
+                raise subprocess.CalledProcessError(return_code, command)
+
+            connection.commit()
+
+            execute_seconds = restore_stats["execute_seconds"]
+            dump_rows = restore_stats.pop("rows_read")
+            stats = {
+                "elapsed": elapsed,
+                "dump": {
+                    "bytes": counter.bytes_read,
+                    "rows": dump_rows,
+                    "bytes_per_second": counter.bytes_read / elapsed if elapsed else 0.0,
+                    "rows_per_second": dump_rows / elapsed if elapsed else 0.0,
+                },
+                "restore": {
+                    **restore_stats,
+                    "bytes_per_second": restore_stats["bytes"] / execute_seconds if execute_seconds else 0.0,
+                    "rows_per_second": restore_stats["rows"] / execute_seconds if execute_seconds else 0.0,
+                },
+            }
+
+            print(f"Data piped from {source_database}.{table_name} to {target_database}.{table_name} "
+                  f"successfully in {elapsed:.3f}s.")
+            print(f"  dump: {stats['dump']['rows']} rows, {stats['dump']['bytes']} bytes "
+                  f"({stats['dump']['rows_per_second']:.0f} rows/s, "
+                  f"{stats['dump']['bytes_per_second']:.0f} bytes/s)")
+            print(f"  restore: {restore_stats['rows']} rows in {restore_stats['statements']} statements "
+                  f"({stats['restore']['rows_per_second']:.0f} rows/s, "
+                  f"{stats['restore']['bytes_per_second']:.0f} bytes/s)")
+
+            return stats
+
+        except (mysql.connector.Error, subprocess.CalledProcessError) as err:
+            connection.rollback()
+            print("Error during pipe process:", err)
+            print(f"{target_database}.{table_name} may be missing or incomplete; run the copy again.")
+
+        finally:
+            if process and process.poll() is None:
+                process.kill()
+                process.wait()
+            connection.close()
+            cursor.close()
+            os.remove(option_file)
+
+
+class HashingWriter(io.RawIOBase):
+    """
+    A binary stream that writes to a file while computing the SHA-256 of everything written.
+
+    Args:
+        raw (io.BufferedIOBase): The file to write to.
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.sha256 = hashlib.sha256()
+        self.bytes_written = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.sha256.update(data)
+        self.bytes_written += len(data)
+        return self.raw.write(data)
+
+
+def list_tables(connection):
+    """
+    Returns the names of the base tables (not views) of the connected database.
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SHOW FULL TABLES WHERE Table_type = 'BASE TABLE'")
+        return [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def table_dependencies(connection, database, table_names):
+    """
+    Finds, for each table, the other tables in ``table_names`` it references through foreign keys.
+
+    Args:
+        connection (mysql.connector.connection.MySQLConnection): A connection to the database.
+        database (str): The name of the database containing the tables.
+        table_names (list): The tables of interest.
+
+    Returns:
+        dict: Maps each table name to the sorted list of tables it depends on.
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            SELECT DISTINCT TABLE_NAME, REFERENCED_TABLE_NAME
+            FROM information_schema.KEY_COLUMN_USAGE
+            WHERE TABLE_SCHEMA = %s AND REFERENCED_TABLE_SCHEMA = %s AND REFERENCED_TABLE_NAME IS NOT NULL
+        """, (database, database))
+        references = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    dependencies = {table: set() for table in table_names}
+    for table, referenced_table in references:
+        if table in dependencies and referenced_table in dependencies and referenced_table != table:
+            dependencies[table].add(referenced_table)
+
+    return {table: sorted(referenced) for table, referenced in dependencies.items()}
+
+
+def dependency_levels(dependencies):
+    """
+    Groups tables into levels so that every table comes after the tables it references.
+
+    Args:
+        dependencies (dict): Maps each table name to the tables it depends on.
+
+    Returns:
+        list: Lists of table names. Tables in the same level can be restored concurrently. Tables caught
+            in a foreign key cycle are placed together in the last level.
+    """
+    remaining = {table: set(referenced) for table, referenced in dependencies.items()}
+    levels = []
+
+    while remaining:
+        level = sorted(table for table, referenced in remaining.items() if not referenced)
+        if not level:
+            levels.append(sorted(remaining))
+            break
+
+        levels.append(level)
+        for table in level:
+            del remaining[table]
+        for referenced in remaining.values():
+            referenced.difference_update(level)
+
+    return levels
+
+
+def backup_table(option_file, source_host, source_database, source_port, table_name, backup_dir, compression):
+    """
+    Dumps one table into a compressed file and returns its manifest entry.
+
+    Args:
+        option_file (str): Path of the client option file from ``write_client_option_file``.
+        source_host (str): The hostname or IP address of the source MySQL server.
+        source_database (str): The name of the source MySQL database.
+        source_port (str): The port number on which the source MySQL server is listening.
+        table_name (str): The name of the table to dump.
+        backup_dir (str): The directory the compressed dump is written to.
+        compression (str): Either "gzip" or "zstd".
+
+    Returns:
+        dict: The table's ``file``, ``rows``, ``dump_bytes``, ``compressed_bytes``, ``sha256`` and ``seconds``.
+
+    Raises:
+        subprocess.CalledProcessError: If mysqldump exits with a non-zero status.
+
+    Note:
+        ``rows`` is the number of rows in the dump's ``INSERT`` statements, counted while the dump is
+        compressed. It comes from the same snapshot as the data, unlike a separate ``COUNT(*)``.
+    """
+    start = time.perf_counter()
+    extension = "sql.zst" if compression == "zstd" else "sql.gz"
+    file_name = f"{table_name}.{extension}"
+    command = build_dump_command(option_file, source_host, source_port, source_database, [table_name])
+    process = subprocess.Popen(command, stdout=subprocess.PIPE)
+
+    try:
+        with open(os.path.join(backup_dir, file_name), 'wb') as f:
+            hashing_writer = HashingWriter(f)
+            if compression == "zstd":
+                compressor = zstandard.ZstdCompressor().stream_writer(hashing_writer, closefd=False)
+            else:
+                compressor = gzip.GzipFile(fileobj=hashing_writer, mode='wb')
+
+            with compressor:
+                reader = CopyingReader(process.stdout, compressor)
+                # The file gets the raw bytes; decoding is only for counting, so invalid UTF-8 is tolerated.
+                with io.TextIOWrapper(io.BufferedReader(reader, 1024 * 1024), encoding='utf-8',
+                                      errors='surrogateescape') as stream:
+                    # mysqldump escapes line breaks inside strings, so every INSERT it writes is one line.
+                    rows = sum(count_insert_rows(line) for line in stream)
+
+        return_code = process.wait()
+        if return_code != 0:
+            raise subprocess.CalledProcessError(return_code, command)
+
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+    return {
+        "file": file_name,
+        "rows": rows,
+        "dump_bytes": reader.bytes_read,
+        "compressed_bytes": hashing_writer.bytes_written,
+        "sha256": hashing_writer.sha256.hexdigest(),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def backup_tables(source_host, source_user, source_password, source_database, source_port,
+                  table_names, backup_dir, workers=4, compression="gzip"):
+    """
+    Dumps several tables concurrently into compressed per-table files and writes a manifest.
+
+    Args:
+        source_host (str): The hostname or IP address of the source MySQL server.
+        source_user (str): The username for accessing the source MySQL database.
+        source_password (str): The password for the specified source MySQL user.
+        source_database (str): The name of the source MySQL database.
+        source_port (str): The port number on which the source MySQL server is listening.
+        table_names (list or str): The tables to dump, or "all" for every base table in the database.
+        backup_dir (str): The directory the dumps and ``manifest.json`` are written to.
+        workers (int): The maximum number of concurrent mysqldump processes.
+        compression (str): Either "gzip" or "zstd". zstd needs the optional ``zstandard`` package.
+
+    Returns:
+        dict or None: The manifest, or None if the backup failed.
+
+    Raises:
+        ValueError: If ``compression`` is not supported or its library is not installed.
+
+    Note:
+        The manifest records, per table, the file name, row count, uncompressed and compressed sizes and
+        the SHA-256 of the compressed file, plus the foreign key dependencies used to order the restore.
+        Each table is dumped in its own transaction, so the files are not a single consistent snapshot
+        of the schema.
+    """
+    if compression not in ("gzip", "zstd"):
+        raise ValueError(f"Unsupported compression: {compression}")
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("zstd compression requires the zstandard package")
+
+    connection = connect_to_database(source_host, source_user, source_password, source_database, source_port)
+
+    if connection:
+        option_file = write_client_option_file(source_user, source_password)
+
+        try:
+            if table_names == "all":
+                table_names = list_tables(connection)
+            dependencies = table_dependencies(connection, source_database, table_names)
+            os.makedirs(backup_dir, exist_ok=True)
+
+            start = time.perf_counter()
+            tables = {}
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(backup_table, option_file, source_host, source_database, source_port,
+                                    table, backup_dir, compression): table
+                    for table in table_names
+                }
+                for future in as_completed(futures):
+                    table = futures[future]
+                    tables[table] = future.result()
+                    tables[table]["dependencies"] = dependencies[table]
+                    print(f"Dumped {source_database}.{table}: {tables[table]['rows']} rows, "
+                          f"{tables[table]['compressed_bytes']} bytes in {tables[table]['seconds']:.3f}s")
+
+            manifest = {
+                "database": source_database,
+                "compression": compression,
+                "created_at": datetime.now().isoformat(),
+                "tables": {table: tables[table] for table in table_names},
+            }
+            with open(os.path.join(backup_dir, "manifest.json"), 'w') as f:
+                json.dump(manifest, f, indent=2)
+
+            print(f"Backed up {len(table_names)} tables from {source_database} to {backup_dir} "
+                  f"in {time.perf_counter() - start:.3f}s.")
+            return manifest
+
+        except (mysql.connector.Error, subprocess.CalledProcessError, OSError) as err:
+            print("Error during backup process:", err)
+
+        finally:
+            connection.close()
+            os.remove(option_file)
+
+
+def restore_table(target_host, target_user, target_password, target_database, target_port,
+                  backup_dir, table_name, entry, chunk_size=1024 * 1024):
+    """
+    Verifies and restores one table of a backup made by ``backup_tables``.
+
+    Args:
+        target_host (str): The hostname or IP address of the target MySQL server.
+        target_user (str): The username for accessing the target MySQL database.
+        target_password (str): The password for the specified target MySQL user.
+        target_database (str): The name of the target MySQL database.
+        target_port (str): The port number on which the target MySQL server is listening.
+        backup_dir (str): The directory containing the backup.
+        table_name (str): The name of the table to restore.
+        entry (dict): The table's manifest entry.
+        chunk_size (int): The number of characters read from the dump file at a time.
+
+    Returns:
+        dict: The restore stats from ``execute_sql_stream`` plus the elapsed ``seconds``.
+
+    Raises:
+        ValueError: If the file's checksum or the restored row count does not match the manifest.
+        mysql.connector.Error: If a statement fails.
+    """
+    start = time.perf_counter()
+    dump_file = os.path.join(backup_dir, entry["file"])
+
+    sha256 = hashlib.sha256()
+    with open(dump_file, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            sha256.update(block)
+    if sha256.hexdigest() != entry["sha256"]:
+        raise ValueError(f"Checksum mismatch for {dump_file}")
+
+    connection = mysql.connector.connect(host=target_host, user=target_user, password=target_password,
+                                         database=target_database, port=target_port)
+    try:
+        cursor = connection.cursor()
+        with open_dump_file(dump_file) as f:
+            stats = execute_sql_stream(cursor, f, chunk_size)
+        connection.commit()
+        cursor.close()
+    finally:
+        connection.close()
+
+    if stats["rows"] < entry["rows"]:
+        raise ValueError(f"Restored {stats['rows']} rows into {table_name}, manifest lists {entry['rows']}")
+
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def restore_tables(target_host, target_user, target_password, target_database, target_port,
+                   backup_dir, workers=4):
+    """
+    Restores a backup made by ``backup_tables`` concurrently, in foreign key dependency order.
+
+    Args:
+        target_host (str): The hostname or IP address of the target MySQL server.
+        target_user (str): The username for accessing the target MySQL database.
+        target_password (str): The password for the specified target MySQL user.
+        target_database (str): The name of the target MySQL database.
+        target_port (str): The port number on which the target MySQL server is listening.
+        backup_dir (str): The directory containing the dumps and ``manifest.json``.
+        workers (int): The maximum number of tables restored concurrently.
+
+    Returns:
+        dict or None: The restore stats of every table, or None if the restore failed.
+
+    Note:
+        Tables are restored level by level: a table is only started once every table it references
+        has been restored. Tables within a level are restored concurrently on their own connections.
+    """
+    with open(os.path.join(backup_dir, "manifest.json"), 'r') as f:
+        manifest = json.load(f)
+
+    tables = manifest["tables"]
+    levels = dependency_levels({table: entry["dependencies"] for table, entry in tables.items()})
+    start = time.perf_counter()
+    results = {}
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for level in levels:
+                futures = {
+                    executor.submit(restore_table, target_host, target_user, target_password, target_database,
+                                    target_port, backup_dir, table, tables[table]): table
+                    for table in level
+                }
+                for future in as_completed(futures):
+                    table = futures[future]
+                    results[table] = future.result()
+                    print(f"Restored {target_database}.{table}: {results[table]['rows']} rows "
+                          f"in {results[table]['seconds']:.3f}s")
+
+        print(f"Restored {len(results)} tables from {backup_dir} to {target_database} "
+              f"in {time.perf_counter() - start:.3f}s.")
+        return results
+
+    except (mysql.connector.Error, ValueError, OSError) as err:
+        print("Error during restore process:", err)
+
+
 source_host = config['datasource']["SOURCE_DATABASE_HOST"]
 source_user = config['datasource']["SOURCE_DATABASE_USER"]
 source_password = config['datasource']["SOURCE_DATABASE_PASS"]
@@ -154,5 +974,17 @@ target_database = config['datasource']["DATABASE_NAME"]
 target_port = config['datasource']["DATABASE_PORT"]
 
 
-dump_data(source_host, source_user, source_password, source_database, source_port, table_name, dump_file)
-restore_data(target_host, target_user, target_password, target_database, target_port, table_name, dump_file)
\ No newline at end of file
+tables = config['datasource'].get("TABLES")
+
+if tables:
+    backup_dir = config['datasource'].get("BACKUP_DIR", "backup")
+    workers = config['datasource'].get("WORKERS", 4)
+    if backup_tables(source_host, source_user, source_password, source_database, source_port, tables, backup_dir,
+                     workers, config['datasource'].get("COMPRESSION", "gzip")):
+        restore_tables(target_host, target_user, target_password, target_database, target_port, backup_dir, workers)
+elif config['datasource'].get("TRANSFER_MODE", "file") == "pipe":
+    pipe_data(source_host, source_user, source_password, source_database, source_port,
+              target_host, target_user, target_password, target_database, target_port, table_name)
+else:
+    dump_data(source_host, source_user, source_password, source_database, source_port, table_name, dump_file)
+    restore_data(target_host, target_user, target_password, target_database, target_port, table_name, dump_file)
\ No newline at end of file
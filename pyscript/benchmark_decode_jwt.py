@@ -0,0 +1,129 @@
+# Load benchmark for the JWT authentication path in decode_jwt.py. It configures a throwaway Django
+# project backed by a local SQLite file, creates USERS users with one token each, and pushes REQUESTS
+# requests through `some_view` on a thread pool and through `asome_view` on an event loop, both with
+# CONCURRENCY requests in flight, first with cold caches and then with warm ones.
+# Run it from this directory: python benchmark_decode_jwt.py (needs Django and PyJWT).
+
+import asyncio
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+import jwt
+from django.conf import settings
+
+USERS = 500
+REQUESTS = 20_000
+CONCURRENCY = 200
+SECRET_KEY = "benchmark-secret-key-of-at-least-32-bytes"
+
+
+def configure_django(database_file):
+    """
+    Configures a minimal Django project using `database_file` as its SQLite database and migrates it.
+    """
+    settings.configure(
+        SECRET_KEY=SECRET_KEY,
+        DEBUG=False,
+        USE_TZ=True,
+        INSTALLED_APPS=["django.contrib.auth", "django.contrib.contenttypes"],
+        DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": database_file}},
+    )
+    django.setup()
+
+    from django.core.management import call_command
+    call_command("migrate", verbosity=0)
+
+
+def create_tokens():
+    """
+    Creates `USERS` users and returns an Authorization header value for each of them.
+    """
+    from django.contrib.auth.models import User
+
+    User.objects.bulk_create(User(username=f"user{index}") for index in range(USERS))
+    expires_at = int(time.time()) + 3600
+    return [
+        "Bearer " + jwt.encode({"user_id": user_id, "exp": expires_at}, SECRET_KEY, algorithm="HS256")
+        for user_id in User.objects.values_list("id", flat=True)
+    ]
+
+
+def run_sync(headers):
+    """
+    Serves every request with `some_view` on a pool of `CONCURRENCY` threads and returns the elapsed time.
+    """
+    from django.db import connection
+    from django.test import RequestFactory
+
+    from decode_jwt import some_view
+
+    factory = RequestFactory()
+    requests = [factory.get("/", headers={"Authorization": header}) for header in headers]
+
+    def serve(request):
+        try:
+            return some_view(request).status_code
+        finally:
+            connection.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+        statuses = list(executor.map(serve, requests))
+    elapsed = time.perf_counter() - start
+
+    assert all(status == 200 for status in statuses)
+    return elapsed
+
+
+def run_async(headers):
+    """
+    Serves every request with `asome_view` on one event loop, `CONCURRENCY` at a time, and returns the
+    elapsed time.
+    """
+    from django.test import AsyncRequestFactory
+
+    from decode_jwt import asome_view
+
+    factory = AsyncRequestFactory()
+    requests = [factory.get("/", headers={"Authorization": header}) for header in headers]
+
+    async def serve_all():
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+
+        async def serve(request):
+            async with semaphore:
+                return (await asome_view(request)).status_code
+
+        return await asyncio.gather(*(serve(request) for request in requests))
+
+    start = time.perf_counter()
+    statuses = asyncio.run(serve_all())
+    elapsed = time.perf_counter() - start
+
+    assert all(status == 200 for status in statuses)
+    return elapsed
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        configure_django(os.path.join(directory, "benchmark.sqlite3"))
+
+        import decode_jwt
+
+        tokens = create_tokens()
+        headers = random.Random(7).choices(tokens, k=REQUESTS)
+        print(f"{REQUESTS} requests over {USERS} tokens, {CONCURRENCY} in flight:")
+
+        for label, run in (("sync view, thread pool", run_sync), ("async view, event loop", run_async)):
+            for cache_state in ("cold", "warm"):
+                if cache_state == "cold":
+                    decode_jwt.token_cache.clear()
+                    decode_jwt.user_cache.clear()
+                elapsed = run(headers)
+                print(f"  {label + ', ' + cache_state + ' caches':<40} {REQUESTS / elapsed:10,.0f} requests/s")
+
+        print(f"  cache counters: {decode_jwt.jwt_cache_stats()}")
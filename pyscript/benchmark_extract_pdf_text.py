@@ -0,0 +1,140 @@
+# Measures PDF text extraction with extract_pdf_text.py against plain `PdfReader(path)` usage on the
+# bundled pressnote1.pdf and on synthesized large PDFs: one repeating the pressnote pages, and one with a
+# unique text page per page in a two-level page tree. For every document and loader it reports the time
+# to the first page's text, pages/sec over a sample of pages spread through the document, the total time
+# for both, and peak RSS. The eager loader parses the whole page tree before the first page, while the lazy
+# one parses tree nodes as pages are reached, so compare totals rather than pages/sec alone.
+# Each measurement runs in a freshly spawned process so peak RSS is not inherited from earlier runs.
+# Run it from this directory: python benchmark_extract_pdf_text.py
+
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from pypdf import PdfReader, PdfWriter
+
+from extract_pdf_text import get_page, get_page_count, iter_pages, open_pdf
+
+PRESSNOTE = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "pressnote1.pdf")
+SYNTHETIC_PAGES = 2000
+SAMPLE_PAGES = 100
+LINES_PER_PAGE = 60
+PAGES_PER_TREE_NODE = 50
+
+
+def synthesize_repeated_pdf(path, source, page_count):
+    reader = PdfReader(source)
+    writer = PdfWriter()
+    for page_number in range(page_count):
+        writer.add_page(reader.pages[page_number % len(reader.pages)])
+    with open(path, "wb") as file:
+        writer.write(file)
+
+
+def synthesize_text_pdf(path, page_count):
+    # Written by hand so every page has its own content stream and the page tree has intermediate nodes,
+    # like the output of most authoring tools.
+    offsets = {}
+    body = bytearray(b"%PDF-1.4\n")
+
+    def add(number, content):
+        offsets[number] = len(body)
+        body.extend(b"%d 0 obj\n" % number + content + b"\nendobj\n")
+
+    node_count = -(-page_count // PAGES_PER_TREE_NODE)
+    first_node, font = 3, 3 + node_count
+    first_page = font + 1
+    add(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = b" ".join(b"%d 0 R" % (first_node + node) for node in range(node_count))
+    add(2, b"<< /Type /Pages /Kids [%s] /Count %d /MediaBox [0 0 612 792] >>" % (kids, page_count))
+    for node in range(node_count):
+        pages = range(node * PAGES_PER_TREE_NODE, min(page_count, (node + 1) * PAGES_PER_TREE_NODE))
+        kids = b" ".join(b"%d 0 R" % (first_page + 2 * page) for page in pages)
+        add(first_node + node,
+            b"<< /Type /Pages /Parent 2 0 R /Kids [%s] /Count %d /Resources << /Font << /F1 %d 0 R >> >> >>"
+            % (kids, len(pages), font))
+    add(font, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for page in range(page_count):
+        lines = [b"(Page %d line %d: the quick brown fox jumps over the lazy dog %d times) Tj T*"
+                 % (page + 1, line, page * line) for line in range(LINES_PER_PAGE)]
+        stream = b"BT /F1 9 Tf 11 TL 40 760 Td\n" + b"\n".join(lines) + b"\nET"
+        add(first_page + 2 * page,
+            b"<< /Type /Page /Parent %d 0 R /Contents %d 0 R >>"
+            % (first_node + page // PAGES_PER_TREE_NODE, first_page + 2 * page + 1))
+        add(first_page + 2 * page + 1, b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+
+    xref = len(body)
+    size = max(offsets) + 1
+    body.extend(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+    for number in range(1, size):
+        body.extend(b"%010d 00000 n \n" % offsets[number])
+    body.extend(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref))
+    with open(path, "wb") as file:
+        file.write(body)
+
+
+def peak_rss_kb():
+    # ru_maxrss survives execve on Linux, so a spawned child would report its parent's peak; VmHWM belongs
+    # to the child's own address space.
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(path, loader):
+    baseline_rss = peak_rss_kb()
+    start = time.perf_counter()
+    if loader == "eager":
+        reader = PdfReader(path)
+        page_count = len(reader.pages)
+        reader.pages[0].extract_text()
+    else:
+        reader = open_pdf(path)
+        page_count = get_page_count(reader)
+        get_page(reader, 0).extract_text()
+    time_to_first_page = time.perf_counter() - start
+
+    sample = range(1, page_count, max(1, page_count // SAMPLE_PAGES))[:SAMPLE_PAGES]
+    start = time.perf_counter()
+    if loader == "eager":
+        pages = ((page_number, reader.pages[page_number]) for page_number in sample)
+    else:
+        pages = iter_pages(reader, sample)
+    for _, page in pages:
+        page.extract_text()
+    sample_time = time.perf_counter() - start
+    pages_per_second = len(sample) / sample_time if sample else 0
+
+    peak_rss = peak_rss_kb()
+    return (page_count, time_to_first_page, pages_per_second, time_to_first_page + sample_time,
+            peak_rss / 1024, (peak_rss - baseline_rss) / 1024)
+
+
+def run(path, loader):
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+        return executor.submit(measure, path, loader).result()
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        repeated = os.path.join(directory, f"pressnote-x{SYNTHETIC_PAGES}.pdf")
+        text = os.path.join(directory, f"text-{SYNTHETIC_PAGES}.pdf")
+        synthesize_repeated_pdf(repeated, PRESSNOTE, SYNTHETIC_PAGES)
+        synthesize_text_pdf(text, SYNTHETIC_PAGES)
+
+        print(f"{'document':<22}{'loader':<8}{'pages':>7}{'size MB':>9}{'first page':>12}"
+              f"{'pages/s':>9}{'total':>9}{'peak RSS':>10}{'RSS growth':>12}")
+        for path in (PRESSNOTE, repeated, text):
+            size = os.path.getsize(path) / (1024 * 1024)
+            for loader in ("eager", "lazy"):
+                pages, first_page, pages_per_second, total, peak_rss, rss_growth = run(path, loader)
+                print(f"{os.path.basename(path):<22}{loader:<8}{pages:>7}{size:>9.1f}{first_page * 1000:>10.1f}ms"
+                      f"{pages_per_second:>9.1f}{total:>8.2f}s{peak_rss:>8.1f}MB{rss_growth:>10.1f}MB")
@@ -0,0 +1,131 @@
+# Measures batch geocoding in locate_addresses.py against the old one-lookup-at-a-time approach, using a
+# local stub of the ArcGIS GeocodeServer (find and reverseGeocode) that answers after a fixed latency and
+# fails a share of requests with 503. The workload is a file of addresses and lat/lng pairs in which most
+# lines repeat an earlier one. The old approach (two serial `geocoder.arcgis` calls per line, as the script
+# used to make) is timed on a slice of the lines; the batch is timed with a cold cache, with a rate limit,
+# and with a warm cache.
+# Run it from this directory: python benchmark_locate_addresses.py
+
+import hashlib
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import geocoder
+
+from locate_addresses import ArcgisProvider, GeocodeCache, geocode_batch, parse_query
+
+LINES = 2_000
+DISTINCT = 400
+LEGACY_LINES = 100
+LATENCY = 0.02
+FAILURE_RATE = 0.05
+WORKERS = 16
+RATE = 200
+
+
+def coordinates(text):
+    digest = hashlib.sha256(text.encode()).digest()
+    return digest[0] / 255 * 180 - 90, digest[1] / 255 * 360 - 180
+
+
+class StubGeocodeServer(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        if random.random() < FAILURE_RATE:
+            self.reply(503, {"error": "unavailable"})
+            return
+
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        if url.path.endswith("/find"):
+            text = params["text"][0]
+            lat, lng = coordinates(text)
+            self.reply(200, {"locations": [
+                {"name": text.title(), "feature": {"geometry": {"x": lng, "y": lat}, "attributes": {"Score": 100}}}
+            ]})
+        else:
+            lng, lat = (float(part) for part in params["location"][0].split(","))
+            self.reply(200, {"address": {"Match_addr": f"Near {lat:.3f}, {lng:.3f}"}, "location": {"x": lng, "y": lat}})
+
+    def reply(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def build_workload():
+    distinct = []
+    for number in range(DISTINCT):
+        if number % 5 == 0:
+            distinct.append(f"{random.uniform(-80, 80):.5f}, {random.uniform(-170, 170):.5f}")
+        else:
+            distinct.append(f"{number} Example Street, Kathmandu")
+    # A skewed popularity, so that like real address lists a few entries make up many lines.
+    return random.choices(distinct, weights=[1 / (rank + 1) for rank in range(DISTINCT)], k=LINES)
+
+
+def legacy(lines, base_url):
+    for line in lines:
+        _, kind, value = parse_query(line)
+        for _ in range(2):
+            if kind == "reverse":
+                geocoder.arcgis(list(value), method="reverse", url=f"{base_url}/reverseGeocode")
+            else:
+                geocoder.arcgis(value, url=f"{base_url}/find")
+
+
+def report(label, lines, elapsed, counts=None):
+    detail = ""
+    if counts:
+        detail = f"  ({counts['looked_up']} looked up, {counts['cached']} cached, {counts['failed']} failed)"
+    print(f"{label:<34}{elapsed:>8.2f}s{lines / elapsed:>10.0f} lines/s{detail}")
+
+
+if __name__ == "__main__":
+    # geocoder logs every failed request, including the injected 503s that are then retried.
+    logging.getLogger("geocoder").setLevel(logging.CRITICAL)
+    random.seed(7)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGeocodeServer)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/arcgis/rest/services/World/GeocodeServer"
+    provider = ArcgisProvider(base_url)
+    lines = build_workload()
+    print(f"{LINES} lines, {len(set(lines))} distinct, {LATENCY * 1000:.0f}ms latency, "
+          f"{FAILURE_RATE:.0%} of requests fail with 503")
+
+    start = time.perf_counter()
+    legacy(lines[:LEGACY_LINES], base_url)
+    report(f"serial, twice per line ({LEGACY_LINES} lines)", LEGACY_LINES, time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = GeocodeCache(os.path.join(directory, "cache.sqlite"))
+        start = time.perf_counter()
+        _, counts = geocode_batch(lines, provider, None, WORKERS, None, backoff=0.05)
+        report(f"batch, {WORKERS} workers, no cache", LINES, time.perf_counter() - start, counts)
+
+        start = time.perf_counter()
+        _, counts = geocode_batch(lines, provider, cache, WORKERS, RATE, backoff=0.05)
+        report(f"batch, limited to {RATE}/s, cold cache", LINES, time.perf_counter() - start, counts)
+
+        start = time.perf_counter()
+        _, counts = geocode_batch(lines, provider, cache, WORKERS, RATE, backoff=0.05)
+        report("batch, warm cache", LINES, time.perf_counter() - start, counts)
+        cache.close()
+
+    server.shutdown()
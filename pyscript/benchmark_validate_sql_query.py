@@ -0,0 +1,122 @@
+# Measures the throughput of the SELECT guard in validate_sql_query_using_regex.py on a synthetic
+# query-gateway workload: a corpus of reporting queries, lookups and a few writes, replayed with a skewed
+# popularity so that, like real traffic, a small set of queries makes up most requests. A second run
+# times long analytical queries without the cache, where the cost of lexing dominates.
+# Run it from this directory: python benchmark_validate_sql_query.py
+
+import random
+import re
+import time
+
+from validate_sql_query_using_regex import SelectQueryValidator
+
+REQUESTS = 200_000
+DISTINCT_QUERIES = 2_000
+
+TEMPLATES = [
+    "SELECT id, name, email FROM users WHERE id = {n}",
+    "SELECT o.id, o.total, c.name\n  FROM orders o\n  JOIN customers c ON c.id = o.customer_id\n"
+    " WHERE o.created_at >= '2024-01-{day:02d}'\n ORDER BY o.total DESC\n LIMIT {n}",
+    "select date_trunc('day', created_at) as day, count(*)\nfrom events\nwhere account_id = {n}\n"
+    "group by 1\norder by 1",
+    "WITH recent AS (SELECT * FROM sessions WHERE started_at > now() - interval '{day} days')\n"
+    "SELECT user_id, count(*) FROM recent GROUP BY user_id HAVING count(*) > {n}",
+    "UPDATE users SET last_seen = now() WHERE id = {n}",
+    "DELETE FROM carts WHERE updated_at < now() - interval '{day} days'",
+    "INSERT INTO audit_log (user_id, action) VALUES ({n}, 'login')",
+]
+
+ANALYTICAL_QUERY = "\n".join(
+    [
+        "-- weekly revenue report: update the thresholds below when finance asks",
+        "WITH orders_by_week AS (",
+        "    SELECT customer_id, date_trunc('week', created_at) AS week, sum(total) AS revenue",
+        "      FROM orders",
+        "     WHERE status <> 'deleted' /* soft-deleted rows are excluded */",
+        "     GROUP BY 1, 2",
+        ")",
+        "SELECT w.week,",
+    ]
+    + [f"       sum(CASE WHEN w.revenue > {n} THEN 1 ELSE 0 END) AS over_{n}," for n in range(0, 4000, 20)]
+    + [
+        "       count(*) AS customers",
+        "  FROM orders_by_week w",
+        "  JOIN customers c ON c.id = w.customer_id AND c.note NOT LIKE '%drop me%'",
+        " GROUP BY w.week",
+        " ORDER BY w.week",
+    ]
+)
+ANALYTICAL_REQUESTS = 2_000
+
+
+def legacy_is_select_query(query):
+    """
+    The original implementation, kept here as the baseline.
+    """
+    forbidden_pattern = r'\b(DROP|DELETE|INSERT|UPDATE|ALTER|CREATE|TRUNCATE)\b'
+    select_pattern = r'\bSELECT\b'
+    query_simplified = re.sub(r'\s+', ' ', query.strip())
+
+    if re.search(forbidden_pattern, query_simplified, re.IGNORECASE):
+        return False
+    return bool(re.search(select_pattern, query_simplified, re.IGNORECASE))
+
+
+def build_workload(seed=7):
+    """
+    Returns `REQUESTS` queries drawn from `DISTINCT_QUERIES` distinct ones with a Zipf-like distribution.
+    """
+    rng = random.Random(seed)
+    corpus = [
+        rng.choice(TEMPLATES).format(n=rng.randint(1, 100_000), day=rng.randint(1, 28))
+        for _ in range(DISTINCT_QUERIES)
+    ]
+    weights = [1 / (rank + 1) for rank in range(DISTINCT_QUERIES)]
+    return rng.choices(corpus, weights=weights, k=REQUESTS)
+
+
+def report(label, requests, seconds):
+    print(f"  {label:<34} {requests / seconds:12,.0f} queries/s")
+
+
+if __name__ == "__main__":
+    workload = build_workload()
+    print(f"{REQUESTS} requests over {len(set(workload))} distinct queries:")
+
+    start = time.perf_counter()
+    legacy = [legacy_is_select_query(query) for query in workload]
+    report("legacy is_select_query", REQUESTS, time.perf_counter() - start)
+
+    uncached = SelectQueryValidator(cache_size=0)
+    start = time.perf_counter()
+    expected = [uncached.is_select(query) for query in workload]
+    report("validator, no cache", REQUESTS, time.perf_counter() - start)
+    print(f"  verdicts differing from legacy:    {sum(a != b for a, b in zip(expected, legacy))}")
+
+    cached = SelectQueryValidator()
+    start = time.perf_counter()
+    results = [cached.is_select(query) for query in workload]
+    report("validator, LRU cache", REQUESTS, time.perf_counter() - start)
+    assert results == expected
+
+    cached = SelectQueryValidator()
+    start = time.perf_counter()
+    results = cached.validate_many(workload)
+    report("validator.validate_many, LRU cache", REQUESTS, time.perf_counter() - start)
+    assert results == expected
+
+    print(f"  cache: {cached.cache_info()}")
+
+    print(f"{ANALYTICAL_REQUESTS} analytical queries of {len(ANALYTICAL_QUERY)} characters, no cache:")
+
+    start = time.perf_counter()
+    for _ in range(ANALYTICAL_REQUESTS):
+        legacy_is_select_query(ANALYTICAL_QUERY)
+    report("legacy is_select_query", ANALYTICAL_REQUESTS, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(ANALYTICAL_REQUESTS):
+        uncached.is_select(ANALYTICAL_QUERY)
+    report("validator", ANALYTICAL_REQUESTS, time.perf_counter() - start)
+    print(f"  verdicts: legacy {legacy_is_select_query(ANALYTICAL_QUERY)}, "
+          f"validator {uncached.is_select(ANALYTICAL_QUERY)}")
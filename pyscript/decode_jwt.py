@@ -1,9 +1,187 @@
 
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
 import jwt
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.http import JsonResponse
 
+TOKEN_CACHE_SIZE = 10000
+USER_CACHE_SIZE = 10000
+USER_CACHE_TTL = 30
+USER_FIELDS = tuple(field.attname for field in User._meta.concrete_fields)
+
+
+class TTLCache:
+    """
+    This class is a thread-safe LRU cache whose entries also expire at a given time.
+
+    Parameters:
+    - maxsize (int): The maximum number of entries; the least recently used entry is evicted beyond it.
+
+    Attributes:
+    - hits, misses, evictions (int): Counters exposed through `stats()`.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Returns the cached value for `key`, or None if it is missing or has expired.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, expires_at):
+        """
+        Stores `value` under `key` until the Unix timestamp `expires_at`.
+        """
+        with self.lock:
+            self.entries[key] = (value, expires_at)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Drops every entry; the counters are kept.
+        """
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """
+        Returns the size, hit, miss and eviction counters and the hit rate of the cache.
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+token_cache = TTLCache(TOKEN_CACHE_SIZE)
+user_cache = TTLCache(USER_CACHE_SIZE)
+
+
+def build_user(entry):
+    """
+    This function builds a new `User` instance from a user cache entry.
+
+    Parameters:
+    - entry (tuple): The database alias the row was read from and the values of `USER_FIELDS`.
+
+    Returns:
+    - User: A fully loaded instance, so callers can modify or save it without affecting other requests
+      and reading a field never queries the database.
+    """
+    db, values = entry
+    return User.from_db(db, USER_FIELDS, values)
+
+
+def get_cached_user(user_id):
+    """
+    This function returns the user with the given id, from a short-lived cache when possible.
+
+    Parameters:
+    - user_id (int): The primary key of the user.
+
+    Returns:
+    - User: A new instance on every call; only the field values are cached.
+
+    Exceptions:
+    - User.DoesNotExist: Raised if there is no such user. Missing users are not cached.
+    """
+    entry = user_cache.get(user_id)
+    if entry is None:
+        queryset = User.objects.values_list(*USER_FIELDS)
+        entry = (queryset.db, queryset.get(id=user_id))
+        user_cache.set(user_id, entry, time.time() + USER_CACHE_TTL)
+    return build_user(entry)
+
+
+async def aget_cached_user(user_id):
+    """
+    This function is the async counterpart of `get_cached_user`, loading missing users with `aget`
+    so the event loop is not blocked by the query.
+
+    Parameters:
+    - user_id (int): The primary key of the user.
+
+    Returns:
+    - User: A new instance on every call; only the field values are cached.
+
+    Exceptions:
+    - User.DoesNotExist: Raised if there is no such user. Missing users are not cached.
+    """
+    entry = user_cache.get(user_id)
+    if entry is None:
+        queryset = User.objects.values_list(*USER_FIELDS)
+        entry = (queryset.db, await queryset.aget(id=user_id))
+        user_cache.set(user_id, entry, time.time() + USER_CACHE_TTL)
+    return build_user(entry)
+
+
+def verify_token(token):
+    """
+    This function returns the user id carried by a bearer token, verifying the token only if it is
+    not already in the verified-token cache.
+
+    Parameters:
+    - token (str): The Authorization header value, "Bearer <jwt>".
+
+    Returns:
+    - int: The `user_id` claim of the token.
+
+    Exceptions:
+    - jwt.ExpiredSignatureError: Raised if the token has expired.
+    - jwt.InvalidTokenError: Raised if the token is invalid.
+    """
+    token = token.split(' ')[1]
+    token_digest = hashlib.sha256(token.encode()).digest()
+    user_id = token_cache.get(token_digest)
+
+    if user_id is None:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=['HS256'])
+        user_id = payload['user_id']
+        token_cache.set(token_digest, user_id, payload.get('exp', time.time() + USER_CACHE_TTL))
+
+    return user_id
+
+
+def jwt_cache_stats():
+    """
+    This function returns the counters of the verified-token and user caches.
+
+    Returns:
+    - dict: `token` and `user` entries as returned by `TTLCache.stats()`.
+    """
+    return {'token': token_cache.stats(), 'user': user_cache.stats()}
+
 
 def decode_jwt_token(token):
     """
@@ -19,20 +197,86 @@ def decode_jwt_token(token):
     Exceptions:
     - jwt.ExpiredSignatureError: Raised if the token has expired.
     - jwt.InvalidTokenError: Raised if the token is invalid.
+
+    Verified tokens are cached by their SHA-256 digest until their `exp` claim (or for
+    `USER_CACHE_TTL` seconds if they have none), and users are cached for `USER_CACHE_TTL`
+    seconds, so a repeated token usually costs neither a signature check nor a query.
     """
     try:
-        token = token.split(' ')[1]
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=['HS256'])
-        user_id = payload['user_id']
+        user_id = verify_token(token)
 
-        user = User.objects.get(id=user_id)
+        user = get_cached_user(user_id)
         return user
     
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
-    
+
+
+async def adecode_jwt_token(token):
+    """
+    This function is the async counterpart of `decode_jwt_token` for ASGI deployments.
+
+    Parameters:
+    - token (str): The JWT token to decode.
+
+    Returns:
+    - User: The user object associated with the provided token if it is valid and not expired.
+    - None: If the token is invalid or expired.
+
+    The signature check runs inline, as it is a short CPU-bound step; only the user lookup is awaited.
+    """
+    try:
+        user_id = verify_token(token)
+
+        user = await aget_cached_user(user_id)
+        return user
+
+    except jwt.ExpiredSignatureError:
+        return None
+    except jwt.InvalidTokenError:
+        return None
+
+
+class JWTAuthenticationMiddleware:
+    """
+    This middleware authenticates the Authorization header once per request and attaches the result
+    as `request.jwt_user` (None when there is no valid token). It runs natively under both WSGI and
+    ASGI, so async views do not pay for a thread hop.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = request.headers.get('Authorization')
+        request.jwt_user = decode_jwt_token(token) if token else None
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        token = request.headers.get('Authorization')
+        request.jwt_user = await adecode_jwt_token(token) if token else None
+        return await self.get_response(request)
+
+
+def authentication_response(token, user):
+    """
+    This function builds the JSON response shared by `some_view` and `asome_view`.
+    """
+    if not token:
+        return JsonResponse({'message': 'No token provided'}, status=401)
+    if user:
+        return JsonResponse({'message': 'User authenticated successfully'})
+    return JsonResponse({'message': 'Invalid or expired token'}, status=401)
+
 
 def some_view(request):
     """
@@ -45,15 +289,35 @@ def some_view(request):
     - JsonResponse: A JSON response indicating the authentication status.
     - If a valid token is provided and successfully decoded, the function returns a success message.
     - If no token is provided or the token is invalid or expired, the function returns an error message with the HTTP status code 401 Unauthorized.
+
+    If `JWTAuthenticationMiddleware` is installed, the user it attached is reused instead of decoding
+    the token again.
     """
     token = request.headers.get('Authorization')
 
-    if token:
-        user = decode_jwt_token(token)
+    if hasattr(request, 'jwt_user'):
+        user = request.jwt_user
+    else:
+        user = decode_jwt_token(token) if token else None
+
+    return authentication_response(token, user)
+
+
+async def asome_view(request):
+    """
+    This function is the async counterpart of `some_view` for ASGI deployments.
+
+    Parameters:
+    - request (HttpRequest): An HTTP request object containing headers.
 
-        if user:
-            return JsonResponse({'message': 'User authenticated successfully'})
-        else:
-            return JsonResponse({'message': 'Invalid or expired token'}, status=401)
+    Returns:
+    - JsonResponse: The same responses as `some_view`.
+    """
+    token = request.headers.get('Authorization')
+
+    if hasattr(request, 'jwt_user'):
+        user = request.jwt_user
     else:
-        return JsonResponse({'message': 'No token provided'}, status=401)
\ No newline at end of file
+        user = await adecode_jwt_token(token) if token else None
+
+    return authentication_response(token, user)
\ No newline at end of file
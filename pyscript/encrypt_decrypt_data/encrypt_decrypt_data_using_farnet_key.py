@@ -1,23 +1,209 @@
-from cryptography.fernet import Fernet
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from cryptography.fernet import Fernet, InvalidToken
+
+# Work is handed to the thread pool in slices rather than item by item, so the
+# executor overhead stays small next to the cost of encrypting a short field.
+MIN_ITEMS_PER_TASK = 256
+STREAM_CHUNK_SIZE = 1024 * 1024
+STREAM_MAGIC = b"FERNET-STREAM-2\n"
+STREAM_ID_SIZE = 16
+# Every chunk's plaintext starts with the random ID written after the magic, its
+# index and a "last chunk" flag, so chunks taken from another stream encrypted
+# with the same key, reordered, dropped or truncated are rejected on decryption.
+CHUNK_HEADER = struct.Struct(">16sQB")
+TOKEN_LENGTH = struct.Struct(">I")
+
+
+class FernetCipher:
+    """
+    A Fernet cipher that is built once from a key and then reused for single values, batches of
+    values and streams of data.
+    """
+
+    def __init__(self, key):
+        """
+        The function decodes the key and sets up the Fernet cipher.
+
+        :param key: A 32-byte URL-safe base64-encoded key, as returned by `Fernet.generate_key()`
+        """
+        self.fernet = Fernet(key)
+
+    def encrypt(self, data):
+        """
+        The function encrypts a single value.
+
+        :param data: The string or bytes to encrypt
+        :return: The Fernet token as bytes.
+        """
+        if isinstance(data, str):
+            data = data.encode()
+        return self.fernet.encrypt(data)
+
+    def decrypt(self, encrypted_data, ttl=None):
+        """
+        The function decrypts a single Fernet token.
+
+        :param encrypted_data: The Fernet token, as bytes or string
+        :param ttl: Optional maximum age of the token in seconds; older tokens are rejected
+        :return: The decrypted data as a string.
+        """
+        return self.fernet.decrypt(encrypted_data, ttl).decode()
+
+    def encrypt_many(self, items, workers=1):
+        """
+        The function encrypts a batch of values, optionally spreading the work across threads.
+
+        :param items: An iterable of strings or bytes to encrypt
+        :param workers: The number of threads to use; 1 encrypts everything in the calling thread
+        :return: A list of Fernet tokens, in the same order as `items`.
+        """
+        return self._map(self.encrypt, items, workers)
+
+    def decrypt_many(self, tokens, workers=1, ttl=None):
+        """
+        The function decrypts a batch of Fernet tokens, optionally spreading the work across
+        threads.
+
+        :param tokens: An iterable of Fernet tokens
+        :param workers: The number of threads to use; 1 decrypts everything in the calling thread
+        :param ttl: Optional maximum age of the tokens in seconds
+        :return: A list of decrypted strings, in the same order as `tokens`. An `InvalidToken`
+        error is raised if any token is invalid.
+        """
+        return self._map(lambda token: self.decrypt(token, ttl), tokens, workers)
+
+    @staticmethod
+    def _map(func, items, workers):
+        items = list(items)
+        if workers <= 1 or len(items) < 2 * MIN_ITEMS_PER_TASK:
+            return [func(item) for item in items]
+
+        task_size = max(MIN_ITEMS_PER_TASK, -(-len(items) // (workers * 4)))
+        slices = [items[start:start + task_size] for start in range(0, len(items), task_size)]
+        results = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for chunk in executor.map(lambda part: [func(item) for item in part], slices):
+                results.extend(chunk)
+        return results
+
+    def encrypt_stream(self, source, destination, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        The function encrypts a binary stream chunk by chunk, so the payload never has to fit in
+        memory.
+
+        :param source: A binary file-like object to read the plaintext from
+        :param destination: A binary file-like object to write the encrypted stream to
+        :param chunk_size: The number of plaintext bytes per encrypted chunk
+        :return: The number of plaintext bytes encrypted.
+        """
+        stream_id = os.urandom(STREAM_ID_SIZE)
+        destination.write(STREAM_MAGIC + stream_id)
+        total = 0
+        index = 0
+        chunk = source.read(chunk_size)
+        while True:
+            next_chunk = source.read(chunk_size)
+            is_last = not next_chunk
+            token = self.fernet.encrypt(CHUNK_HEADER.pack(stream_id, index, is_last) + chunk)
+            destination.write(TOKEN_LENGTH.pack(len(token)))
+            destination.write(token)
+            total += len(chunk)
+            if is_last:
+                return total
+            chunk = next_chunk
+            index += 1
+
+    def decrypt_stream(self, source, destination):
+        """
+        The function decrypts a stream written by `encrypt_stream`.
+
+        :param source: A binary file-like object to read the encrypted stream from
+        :param destination: A binary file-like object to write the plaintext to
+        :return: The number of plaintext bytes written. An `InvalidToken` error is raised if the
+        stream is corrupted, reordered or truncated, or holds chunks of another stream.
+        """
+        if source.read(len(STREAM_MAGIC)) != STREAM_MAGIC:
+            raise InvalidToken("Not a Fernet stream")
+        stream_id = source.read(STREAM_ID_SIZE)
+
+        total = 0
+        index = 0
+        while True:
+            length = source.read(TOKEN_LENGTH.size)
+            if len(length) != TOKEN_LENGTH.size:
+                raise InvalidToken("Fernet stream is truncated")
+            token = source.read(TOKEN_LENGTH.unpack(length)[0])
+            plaintext = self.fernet.decrypt(token)
+            if len(plaintext) < CHUNK_HEADER.size:
+                raise InvalidToken("Fernet stream chunk has no header")
+            chunk_stream_id, chunk_index, is_last = CHUNK_HEADER.unpack_from(plaintext)
+            if chunk_stream_id != stream_id:
+                raise InvalidToken("Fernet stream chunk belongs to another stream")
+            if chunk_index != index:
+                raise InvalidToken("Fernet stream chunks are out of order")
+            destination.write(plaintext[CHUNK_HEADER.size:])
+            total += len(plaintext) - CHUNK_HEADER.size
+            if is_last:
+                if source.read(1):
+                    raise InvalidToken("Unexpected data after the last Fernet stream chunk")
+                return total
+            index += 1
+
+    def encrypt_file(self, source_path, destination_path, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        The function encrypts a file into the chunked Fernet stream format.
+
+        :param source_path: The path of the file to encrypt
+        :param destination_path: The path of the encrypted file to write
+        :param chunk_size: The number of plaintext bytes per encrypted chunk
+        :return: The number of plaintext bytes encrypted.
+        """
+        with open(source_path, "rb") as source, open(destination_path, "wb") as destination:
+            return self.encrypt_stream(source, destination, chunk_size)
+
+    def decrypt_file(self, source_path, destination_path):
+        """
+        The function decrypts a file written by `encrypt_file`.
+
+        :param source_path: The path of the encrypted file
+        :param destination_path: The path of the decrypted file to write
+        :return: The number of plaintext bytes written.
+        """
+        with open(source_path, "rb") as source, open(destination_path, "wb") as destination:
+            return self.decrypt_stream(source, destination)
+
+
+@lru_cache(maxsize=32)
+def get_cipher(key):
+    """
+    The function returns a cached `FernetCipher` for the key, so the key is decoded only once.
+
+    :param key: A 32-byte URL-safe base64-encoded key, as bytes or string
+    :return: The `FernetCipher` for the key.
+    """
+    return FernetCipher(key)
 
 
 def encrypt_payload(key, data):
     """
     The function encrypts data using a given key.
-    
+
     :param key: The key is a secret key used for encryption. It should be a 32-byte string encoded in
     base64
     :param data: The `data` parameter is the string that you want to encrypt
     :return: The encrypted version of the data.
     """
-    fernet = Fernet(key)
-    return fernet.encrypt(data.encode())
+    return get_cipher(key).encrypt(data)
 
 
 def decrypt_payload(key, encrypted_data):
     """
     The function decrypts encrypted data using a given key.
-    
+
     :param key: The key is a bytes-like object that is used to encrypt and decrypt the data. It should
     be a 32-byte URL-safe base64-encoded string
     :param encrypted_data: The encrypted data is the data that has been encoded using a specific
@@ -25,5 +211,4 @@ def decrypt_payload(key, encrypted_data):
     correct decryption key
     :return: The decrypted data as a string.
     """
-    fernet = Fernet(key)
-    return fernet.decrypt(encrypted_data).decode()
\ No newline at end of file
+    return get_cipher(key).decrypt(encrypted_data)
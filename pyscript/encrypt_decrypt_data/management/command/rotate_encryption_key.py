@@ -0,0 +1,386 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+DEFAULT_BATCH_SIZE = 1000
+# Same header as the chunked files written by FernetCipher.encrypt_stream, followed by a random stream
+# ID. Every chunk of such a file is a Fernet token, so it is rotated token by token like any other input;
+# the chunks embed the stream ID, so the header and ID are copied as is.
+STREAM_MAGIC = b"FERNET-STREAM-2\n"
+STREAM_ID_SIZE = 16
+IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+_rotator = None
+
+
+def build_rotator(new_key, old_keys):
+    """
+    The function builds the MultiFernet used for rotation. The new key comes first, so it is the
+    one tokens are re-encrypted with; the old keys are only used to decrypt.
+
+    :param new_key: The key to rotate to
+    :param old_keys: The keys the existing tokens may be encrypted with
+    :return: A `MultiFernet` instance.
+    """
+    return MultiFernet([Fernet(new_key)] + [Fernet(key) for key in old_keys])
+
+
+def _init_worker(new_key, old_keys):
+    global _rotator
+    _rotator = build_rotator(new_key, old_keys)
+
+
+def _rotate_token(token):
+    # Empty values and NULLs are passed through untouched, and text columns stay text.
+    if not token:
+        return token
+    rotated = _rotator.rotate(token)
+    return rotated.decode() if isinstance(token, str) else rotated
+
+
+def _rotate_batch(tokens):
+    return [_rotate_token(token) for token in tokens]
+
+
+def rotate_batches(batches, new_key, old_keys, workers=1):
+    """
+    The function re-encrypts batches of tokens with the new key, fanning out across processes.
+
+    :param batches: An iterable of `(context, tokens)` pairs; the context is handed back untouched
+    :param new_key: The key to rotate to
+    :param old_keys: The keys the existing tokens may be encrypted with
+    :param workers: The number of worker processes; 1 rotates in the calling process
+    :return: A generator of `(context, rotated_tokens)` pairs, in input order. At most two batches
+    per worker are in flight, so the input is streamed rather than loaded up front.
+    """
+    if workers <= 1:
+        _init_worker(new_key, old_keys)
+        for context, tokens in batches:
+            yield context, _rotate_batch(tokens)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(new_key, old_keys)) as executor:
+        pending = deque()
+        for context, tokens in batches:
+            pending.append((context, executor.submit(_rotate_batch, tokens)))
+            if len(pending) >= workers * 2:
+                context, future = pending.popleft()
+                yield context, future.result()
+        while pending:
+            context, future = pending.popleft()
+            yield context, future.result()
+
+
+def key_fingerprint(key):
+    """
+    The function returns a short, non-reversible fingerprint of a key for the checkpoint file.
+
+    :param key: The Fernet key
+    :return: The first 16 hex digits of the key's SHA-256.
+    """
+    if isinstance(key, str):
+        key = key.encode()
+    return hashlib.sha256(key).hexdigest()[:16]
+
+
+def load_checkpoint(state_file, source, new_key):
+    """
+    The function reads the progress of a previous rotation of the same source to the same key.
+
+    :param state_file: The path of the JSON checkpoint file, or None to disable checkpointing
+    :param source: A string identifying the file or table being rotated
+    :param new_key: The key being rotated to
+    :return: The saved position, or None if there is no usable checkpoint.
+    """
+    if not state_file or not os.path.exists(state_file):
+        return None
+
+    with open(state_file, "r") as file:
+        entry = json.load(file).get(source)
+
+    if not entry or entry["new_key"] != key_fingerprint(new_key):
+        return None
+    return entry["position"]
+
+
+def save_checkpoint(state_file, source, new_key, position):
+    """
+    The function atomically records the progress of a rotation in the checkpoint file.
+
+    :param state_file: The path of the JSON checkpoint file, or None to disable checkpointing
+    :param source: A string identifying the file or table being rotated
+    :param new_key: The key being rotated to
+    :param position: The JSON-serializable position to resume from
+    """
+    if not state_file:
+        return
+
+    state = {}
+    if os.path.exists(state_file):
+        with open(state_file, "r") as file:
+            state = json.load(file)
+
+    state[source] = {"new_key": key_fingerprint(new_key), "position": position}
+    temporary_file = f"{state_file}.tmp"
+    with open(temporary_file, "w") as file:
+        json.dump(state, file, indent=2)
+    os.replace(temporary_file, state_file)
+
+
+def iter_line_batches(file, batch_size):
+    """
+    The function reads a file holding one token per line in batches.
+
+    :param file: A binary file object positioned where reading should start
+    :param batch_size: The number of tokens per batch
+    :return: A generator of `(end_offset, tokens)` pairs.
+    """
+    tokens = []
+    for line in iter(file.readline, b""):
+        tokens.append(line.rstrip(b"\r\n"))
+        if len(tokens) >= batch_size:
+            yield file.tell(), tokens
+            tokens = []
+    if tokens:
+        yield file.tell(), tokens
+
+
+def iter_stream_batches(file, batch_size):
+    """
+    The function reads the chunks of an `encrypt_stream` file in batches.
+
+    :param file: A binary file object positioned after the header and stream ID, or on a chunk boundary
+    :param batch_size: The number of chunks per batch
+    :return: A generator of `(end_offset, tokens)` pairs.
+    """
+    tokens = []
+    while True:
+        length = file.read(4)
+        if not length:
+            break
+        if len(length) != 4:
+            raise InvalidToken("Fernet stream is truncated")
+        tokens.append(file.read(int.from_bytes(length, "big")))
+        if len(tokens) >= batch_size:
+            yield file.tell(), tokens
+            tokens = []
+    if tokens:
+        yield file.tell(), tokens
+
+
+def rotate_file(input_path, output_path, new_key, old_keys, file_format="lines",
+                batch_size=DEFAULT_BATCH_SIZE, workers=1, state_file=None, progress=None):
+    """
+    The function re-encrypts every token of a file with the new key and writes them to a new file.
+
+    :param input_path: The file to rotate, either one token per line or an `encrypt_stream` file
+    :param output_path: The file to write the rotated tokens to; it must differ from `input_path`
+    :param new_key: The key to rotate to
+    :param old_keys: The keys the existing tokens may be encrypted with
+    :param file_format: "lines" or "stream"
+    :param batch_size: The number of tokens sent to a worker at a time
+    :param workers: The number of worker processes
+    :param state_file: Optional JSON checkpoint file; an interrupted run resumes after the last
+    written batch
+    :param progress: Optional callable receiving the number of tokens rotated after every batch
+    :return: The number of tokens rotated by this run.
+    """
+    if os.path.abspath(input_path) == os.path.abspath(output_path):
+        raise ValueError("The output file must differ from the input file")
+    if file_format not in ("lines", "stream"):
+        raise ValueError(f"Unknown file format: {file_format}")
+
+    source = f"file:{os.path.abspath(input_path)}"
+    position = load_checkpoint(state_file, source, new_key)
+    rotated = 0
+
+    with open(input_path, "rb") as input_file:
+        if position:
+            input_file.seek(position["input_offset"])
+            output_file = open(output_path, "r+b")
+            output_file.truncate(position["output_offset"])
+            output_file.seek(position["output_offset"])
+        else:
+            output_file = open(output_path, "wb")
+            if file_format == "stream":
+                if input_file.read(len(STREAM_MAGIC)) != STREAM_MAGIC:
+                    raise InvalidToken("Not a Fernet stream")
+                stream_id = input_file.read(STREAM_ID_SIZE)
+                if len(stream_id) != STREAM_ID_SIZE:
+                    raise InvalidToken("Fernet stream is truncated")
+                output_file.write(STREAM_MAGIC + stream_id)
+
+        with output_file:
+            if file_format == "lines":
+                batches = iter_line_batches(input_file, batch_size)
+            else:
+                batches = iter_stream_batches(input_file, batch_size)
+
+            for input_offset, tokens in rotate_batches(batches, new_key, old_keys, workers):
+                if file_format == "lines":
+                    output_file.write(b"".join(token + b"\n" for token in tokens))
+                else:
+                    output_file.write(b"".join(len(token).to_bytes(4, "big") + token for token in tokens))
+                output_file.flush()
+                save_checkpoint(state_file, source, new_key,
+                                {"input_offset": input_offset, "output_offset": output_file.tell()})
+                rotated += len(tokens)
+                if progress:
+                    progress(rotated)
+
+    return rotated
+
+
+def iter_table_batches(connection, table, column, pk, batch_size, start_pk=None, placeholder="%s"):
+    """
+    The function pages through a table by primary key.
+
+    :param connection: A DB-API connection
+    :param table: The table holding the encrypted column
+    :param column: The encrypted column
+    :param pk: The primary key column, used for keyset pagination
+    :param batch_size: The number of rows per page
+    :param start_pk: Only rows with a primary key greater than this are read
+    :param placeholder: The parameter placeholder of the connection, "%s" or "?"
+    :return: A generator of `(primary_keys, tokens)` pairs.
+    """
+    cursor = connection.cursor()
+    while True:
+        if start_pk is None:
+            cursor.execute(f"SELECT {pk}, {column} FROM {table} ORDER BY {pk} LIMIT {placeholder}",
+                           (batch_size,))
+        else:
+            cursor.execute(f"SELECT {pk}, {column} FROM {table} WHERE {pk} > {placeholder} "
+                           f"ORDER BY {pk} LIMIT {placeholder}", (start_pk, batch_size))
+        rows = cursor.fetchall()
+        if not rows:
+            break
+        yield [row[0] for row in rows], [row[1] for row in rows]
+        start_pk = rows[-1][0]
+    cursor.close()
+
+
+def rotate_table(connection, table, column, pk, new_key, old_keys, batch_size=DEFAULT_BATCH_SIZE,
+                 workers=1, state_file=None, placeholder="%s", progress=None):
+    """
+    The function re-encrypts an encrypted column in place with the new key, committing each batch.
+
+    :param connection: A DB-API connection
+    :param table: The table holding the encrypted column
+    :param column: The encrypted column
+    :param pk: The primary key column
+    :param new_key: The key to rotate to
+    :param old_keys: The keys the existing tokens may be encrypted with
+    :param batch_size: The number of rows per batch
+    :param workers: The number of worker processes
+    :param state_file: Optional JSON checkpoint file; an interrupted run resumes after the last
+    committed batch
+    :param placeholder: The parameter placeholder of the connection, "%s" or "?"
+    :param progress: Optional callable receiving the number of rows rotated after every batch
+    :return: The number of rows rotated by this run.
+    """
+    for identifier in (table, column, pk):
+        if not IDENTIFIER_PATTERN.match(identifier):
+            raise ValueError(f"Invalid identifier: {identifier}")
+
+    source = f"table:{table}.{column}"
+    position = load_checkpoint(state_file, source, new_key)
+    start_pk = position["last_pk"] if position else None
+    batches = iter_table_batches(connection, table, column, pk, batch_size, start_pk, placeholder)
+    update = f"UPDATE {table} SET {column} = {placeholder} WHERE {pk} = {placeholder}"
+    rotated = 0
+
+    cursor = connection.cursor()
+    for primary_keys, tokens in rotate_batches(batches, new_key, old_keys, workers):
+        cursor.executemany(update, list(zip(tokens, primary_keys)))
+        connection.commit()
+        save_checkpoint(state_file, source, new_key, {"last_pk": primary_keys[-1]})
+        rotated += len(primary_keys)
+        if progress:
+            progress(rotated)
+    cursor.close()
+
+    return rotated
+
+
+class Command(BaseCommand):
+    help = 'Re-encrypt Fernet tokens in a file or a table column with a new key'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--new-key', required=True, help='The key to rotate to')
+        parser.add_argument('--old-key', action='append', required=True, dest='old_keys',
+                            help='A key the existing data may be encrypted with; repeat for several keys')
+        parser.add_argument('--file', help='Rotate the tokens of this file')
+        parser.add_argument('--output', help='Where to write the rotated file')
+        parser.add_argument('--format', choices=['lines', 'stream'], default='lines',
+                            help='One token per line, or a chunked encrypt_stream file')
+        parser.add_argument('--table', help='Rotate a column of this table in place')
+        parser.add_argument('--column', help='The encrypted column of --table')
+        parser.add_argument('--pk', default='id', help='The primary key column of --table')
+        parser.add_argument('--database', default='default', help='The Django database alias to use')
+        parser.add_argument('--sqlite', help='Use this SQLite file instead of a Django database')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--state-file', help='JSON checkpoint file used to resume an interrupted run')
+
+    def handle(self, *args, **options):
+        """
+        The function re-encrypts a file or a table column with the new key and reports the
+        throughput.
+        """
+        started = time.perf_counter()
+        last_report = [started]
+
+        def progress(rows):
+            now = time.perf_counter()
+            if now - last_report[0] >= 1:
+                last_report[0] = now
+                self.stdout.write(f'Rotated {rows} rows ({rows / (now - started):.0f} rows/sec)')
+
+        common = {
+            'new_key': options['new_key'],
+            'old_keys': options['old_keys'],
+            'batch_size': options['batch_size'],
+            'workers': options['workers'],
+            'state_file': options['state_file'],
+            'progress': progress,
+        }
+
+        try:
+            if options['file']:
+                if not options['output']:
+                    raise CommandError('--output is required with --file')
+                rows = rotate_file(options['file'], options['output'], file_format=options['format'], **common)
+            elif options['table']:
+                if not options['column']:
+                    raise CommandError('--column is required with --table')
+                if options['sqlite']:
+                    connection = sqlite3.connect(options['sqlite'])
+                    placeholder = '?'
+                else:
+                    connection = connections[options['database']]
+                    placeholder = '%s'
+                try:
+                    rows = rotate_table(connection, options['table'], options['column'], options['pk'],
+                                        placeholder=placeholder, **common)
+                finally:
+                    if options['sqlite']:
+                        connection.close()
+            else:
+                raise CommandError('Either --file or --table is required')
+        except (InvalidToken, ValueError) as err:
+            raise CommandError(f'Key rotation failed: {err!r}')
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Rotated {rows} rows in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:.0f} rows/sec)'))
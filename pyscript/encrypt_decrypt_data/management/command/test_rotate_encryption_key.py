@@ -0,0 +1,109 @@
+import io
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+from cryptography.fernet import Fernet, InvalidToken
+
+from rotate_encryption_key import rotate_file, rotate_table
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from encrypt_decrypt_data_using_farnet_key import FernetCipher  # noqa: E402
+
+OLD_KEY = Fernet.generate_key()
+NEW_KEY = Fernet.generate_key()
+VALUES = [f"secret {number}" for number in range(25)]
+
+
+class Interrupted(Exception):
+    pass
+
+
+def interrupt_after(batches):
+    def progress(rotated):
+        progress.calls += 1
+        if progress.calls >= batches:
+            raise Interrupted
+    progress.calls = 0
+    return progress
+
+
+def write_lines(path):
+    old = Fernet(OLD_KEY)
+    path.write_bytes(b"".join(old.encrypt(value.encode()) + b"\n" for value in VALUES))
+
+
+def read_lines(path):
+    new = Fernet(NEW_KEY)
+    return [new.decrypt(line).decode() for line in path.read_bytes().splitlines()]
+
+
+def test_rotate_lines_file(tmp_path):
+    write_lines(tmp_path / "tokens.txt")
+
+    rotated = rotate_file(tmp_path / "tokens.txt", tmp_path / "rotated.txt", NEW_KEY, [OLD_KEY], batch_size=4)
+
+    assert rotated == len(VALUES)
+    assert read_lines(tmp_path / "rotated.txt") == VALUES
+
+
+def test_rotate_lines_file_resumes_from_checkpoint(tmp_path):
+    write_lines(tmp_path / "tokens.txt")
+    state_file = tmp_path / "state.json"
+    arguments = (tmp_path / "tokens.txt", tmp_path / "rotated.txt", NEW_KEY, [OLD_KEY])
+
+    with pytest.raises(Interrupted):
+        rotate_file(*arguments, batch_size=4, state_file=state_file, progress=interrupt_after(2))
+    rotated = rotate_file(*arguments, batch_size=4, state_file=state_file)
+
+    assert rotated == len(VALUES) - 8
+    assert read_lines(tmp_path / "rotated.txt") == VALUES
+
+
+def test_rotate_stream_file_resumes_from_checkpoint(tmp_path):
+    plaintext = bytes(range(256)) * 40
+    with open(tmp_path / "data.enc", "wb") as destination:
+        FernetCipher(OLD_KEY).encrypt_stream(io.BytesIO(plaintext), destination, chunk_size=1000)
+    state_file = tmp_path / "state.json"
+    arguments = (tmp_path / "data.enc", tmp_path / "rotated.enc", NEW_KEY, [OLD_KEY])
+
+    with pytest.raises(Interrupted):
+        rotate_file(*arguments, "stream", batch_size=3, state_file=state_file, progress=interrupt_after(1))
+    rotated = rotate_file(*arguments, "stream", batch_size=3, state_file=state_file)
+
+    assert rotated == 11 - 3
+    decrypted = io.BytesIO()
+    with open(tmp_path / "rotated.enc", "rb") as source:
+        FernetCipher(NEW_KEY).decrypt_stream(source, decrypted)
+    assert decrypted.getvalue() == plaintext
+    with pytest.raises(InvalidToken), open(tmp_path / "rotated.enc", "rb") as source:
+        FernetCipher(OLD_KEY).decrypt_stream(source, io.BytesIO())
+
+
+def test_rotate_table_resumes_from_checkpoint(tmp_path):
+    old = Fernet(OLD_KEY)
+    connection = sqlite3.connect(tmp_path / "data.sqlite")
+    connection.execute("CREATE TABLE accounts (id INTEGER PRIMARY KEY, secret TEXT)")
+    connection.executemany("INSERT INTO accounts (secret) VALUES (?)",
+                           [(old.encrypt(value.encode()).decode(),) for value in VALUES] + [(None,), ("",)])
+    connection.commit()
+    state_file = tmp_path / "state.json"
+    arguments = (connection, "accounts", "secret", "id", NEW_KEY, [OLD_KEY])
+
+    with pytest.raises(Interrupted):
+        rotate_table(*arguments, batch_size=10, state_file=state_file, placeholder="?",
+                     progress=interrupt_after(1))
+    rotated = rotate_table(*arguments, batch_size=10, state_file=state_file, placeholder="?")
+
+    assert rotated == len(VALUES) + 2 - 10
+    new = Fernet(NEW_KEY)
+    secrets = [secret for _, secret in connection.execute("SELECT id, secret FROM accounts ORDER BY id")]
+    assert [new.decrypt(secret.encode()).decode() for secret in secrets[:len(VALUES)]] == VALUES
+    assert secrets[len(VALUES):] == [None, ""]
+    connection.close()
+
+
+def test_rotate_table_rejects_unsafe_identifiers():
+    with pytest.raises(ValueError):
+        rotate_table(sqlite3.connect(":memory:"), "accounts; DROP TABLE x", "secret", "id", NEW_KEY, [OLD_KEY])
@@ -1,18 +1,354 @@
-# This code is importing the `PdfReader` class from the `pypdf` module and using it to read a PDF file
-# named "pressnote1.pdf". It then determines the number of pages in the PDF and extracts the text from
-# the first page using the `extract_text()` method. Finally, it prints the extracted text to the
-# console.
-
- # Importing the PdfReader class from PyPDF2 library
-from pypdf import PdfReader
-
-# Creating a PdfReader object by passing the PDF file path
-reader = PdfReader("pressnote1.pdf", "rb")
- # Getting the total number of pages in the PDF
-number_of_pages = len(reader.pages)
-# Accessing the first page of the PDF (index starts from 0)
-page = reader.pages[0]
-# Extracting the text content from the page
-text = page.extract_text()
-# Printing the extracted text
-print(text)
\ No newline at end of file
+# Extracts the text of PDF files page by page with the `PdfReader` class from the `pypdf` module and
+# writes one JSON object per page ({"file", "sha256", "page", "text"}) to a JSONL file or stdout.
+# Pages are spread over a process pool in small ranges, and the text of every page is cached on disk
+# by file hash and page number, so re-running over unchanged documents only costs hashing the files.
+# Usage: python extract_pdf_text.py pressnote1.pdf [more.pdf | directory ...] --output pages.jsonl
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import sqlite3
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pypdf
+from pypdf import PageObject, PdfReader
+from pypdf.generic import IndirectObject, NameObject
+
+DEFAULT_CACHE_FILE = ".pdf_text_cache.sqlite"
+DEFAULT_PAGES_PER_TASK = 8
+# Text extracted by another pypdf version may differ, so it is cached separately.
+EXTRACTOR_VERSION = f"pypdf-{pypdf.__version__}"
+# Page attributes a page inherits from its ancestors in the page tree when it does not set them itself.
+INHERITABLE_PAGE_ATTRIBUTES = ("/Resources", "/MediaBox", "/CropBox", "/Rotate")
+
+
+def file_hash(path, chunk_size=1024 * 1024):
+    """
+    The function computes the SHA-256 of a file without reading it into memory at once.
+    :param path: The path of the file
+    :param chunk_size: The number of bytes read at a time
+    :return: The hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def open_pdf(path):
+    """
+    The function opens a PDF over a read-only memory map. Given a path, `PdfReader` copies the whole
+    file into memory first; over a memory map only the parts that are actually parsed are read, and
+    the pages are shared with the OS page cache instead of being copied.
+    :param path: The path of the PDF file
+    :return: A `PdfReader` for the file.
+    """
+    with open(path, "rb") as file:
+        # The mapping stays valid after the file is closed.
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return PdfReader(buffer)
+
+
+def _is_page_tree_node(node):
+    if "/Type" in node:
+        return node["/Type"] == "/Pages"
+    return "/Kids" in node
+
+
+def _build_page(reader, kid, node, inherited):
+    page = PageObject(reader, kid if isinstance(kid, IndirectObject) else None)
+    page.update(node)
+    for attribute, value in inherited.items():
+        if attribute not in page:
+            page[NameObject(attribute)] = value
+    return page
+
+
+def _inherit(node, inherited):
+    attributes = {attribute: node[attribute] for attribute in INHERITABLE_PAGE_ATTRIBUTES if attribute in node}
+    return {**inherited, **attributes} if attributes else inherited
+
+
+def get_page(reader, page_number):
+    """
+    The function returns a single page without flattening the page tree. `reader.pages[n]` resolves
+    every page object of the document on first use; this walks down the tree using the page counts of
+    its nodes, so only the nodes on the way to the page are parsed. Use `iter_pages` for more than one
+    page, since every call walks from the root again.
+    :param reader: A `PdfReader`
+    :param page_number: The zero-based page number
+    :return: The `PageObject`, with inherited attributes applied.
+    """
+    try:
+        kid = reader.trailer["/Root"]["/Pages"]
+        node = kid.get_object()
+        inherited = {}
+        remaining = page_number
+        while _is_page_tree_node(node):
+            inherited = _inherit(node, inherited)
+            for kid in node["/Kids"]:
+                kid_node = kid.get_object()
+                size = int(kid_node["/Count"]) if _is_page_tree_node(kid_node) else 1
+                if remaining < size:
+                    node = kid_node
+                    break
+                remaining -= size
+            else:
+                raise IndexError(f"Page {page_number} is out of range")
+    except (KeyError, TypeError, ValueError):
+        # Malformed page trees (missing or wrong counts) are left to pypdf's own, eager handling.
+        return reader.pages[page_number]
+
+    return _build_page(reader, kid, node, inherited)
+
+
+def iter_pages(reader, page_numbers=None):
+    """
+    The function yields pages in ascending order from a single walk of the page tree, so extracting a
+    range costs one pass instead of one walk from the root per page. Subtrees holding none of the
+    requested pages are skipped by their page count, and nothing past the last requested page is read.
+    :param reader: A `PdfReader`
+    :param page_numbers: Optional iterable of zero-based page numbers; all pages by default
+    :return: A generator of `(page_number, PageObject)` tuples, in ascending page order.
+    """
+    wanted = range(get_page_count(reader)) if page_numbers is None else sorted(set(page_numbers))
+    if len(wanted) <= 1:
+        for page_number in wanted:
+            yield page_number, get_page(reader, page_number)
+        return
+
+    targets = iter(wanted)
+    target = next(targets)
+    position = 0
+    try:
+        stack = [(reader.trailer["/Root"]["/Pages"], {})]
+        while stack:
+            kid, inherited = stack.pop()
+            node = kid.get_object()
+            if _is_page_tree_node(node):
+                count = int(node["/Count"])
+                if position + count <= target:
+                    position += count
+                    continue
+                inherited = _inherit(node, inherited)
+                stack.extend((child, inherited) for child in reversed(node["/Kids"]))
+                continue
+            if position == target:
+                yield target, _build_page(reader, kid, node, inherited)
+                target = next(targets, None)
+                if target is None:
+                    return
+            position += 1
+    except (KeyError, TypeError, ValueError):
+        # Malformed page trees are left to pypdf's own, eager handling from the first page not yet yielded.
+        for page_number in [target, *targets]:
+            yield page_number, reader.pages[page_number]
+        return
+    raise IndexError(f"Page {target} is out of range")
+
+
+def get_page_count(reader):
+    """
+    The function returns the number of pages from the root of the page tree, without flattening it.
+    :param reader: A `PdfReader`
+    :return: The number of pages.
+    """
+    try:
+        return int(reader.trailer["/Root"]["/Pages"]["/Count"])
+    except (KeyError, TypeError, ValueError):
+        return len(reader.pages)
+
+
+def iter_page_text(path, page_numbers=None):
+    """
+    The function yields the text of a PDF page by page, so callers can process a document before it
+    has been extracted completely. Pages are parsed only when they are reached.
+    :param path: The path of the PDF file
+    :param page_numbers: Optional iterable of zero-based page numbers; all pages by default
+    :return: A generator of `(page_number, text)` tuples, in ascending page order.
+    """
+    for page_number, page in iter_pages(open_pdf(path), page_numbers):
+        yield page_number, page.extract_text()
+
+
+def count_pages(path):
+    """
+    The function returns the number of pages of a PDF.
+    :param path: The path of the PDF file
+    :return: The number of pages.
+    """
+    return get_page_count(open_pdf(path))
+
+
+def extract_page_range(path, page_numbers):
+    """
+    The function extracts a range of pages in a worker process.
+    :param path: The path of the PDF file
+    :param page_numbers: The zero-based page numbers to extract
+    :return: A list of `(page_number, text)` tuples.
+    """
+    return list(iter_page_text(path, page_numbers))
+
+
+class PageCache:
+    """
+    An on-disk cache of extracted page text, keyed by file hash, extractor version and page number.
+    It is only used from the parent process, so workers never contend for the SQLite file.
+    """
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            " sha256 TEXT, extractor TEXT, page_count INTEGER, PRIMARY KEY (sha256, extractor))"
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " sha256 TEXT, extractor TEXT, page INTEGER, text TEXT, PRIMARY KEY (sha256, extractor, page))"
+        )
+        self.connection.commit()
+
+    def get_page_count(self, sha256):
+        row = self.connection.execute(
+            "SELECT page_count FROM documents WHERE sha256 = ? AND extractor = ?", (sha256, EXTRACTOR_VERSION)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_page_count(self, sha256, page_count):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO documents VALUES (?, ?, ?)", (sha256, EXTRACTOR_VERSION, page_count)
+        )
+        self.connection.commit()
+
+    def get_pages(self, sha256):
+        rows = self.connection.execute(
+            "SELECT page, text FROM pages WHERE sha256 = ? AND extractor = ?", (sha256, EXTRACTOR_VERSION)
+        )
+        return dict(rows)
+
+    def set_pages(self, sha256, pages):
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)",
+            [(sha256, EXTRACTOR_VERSION, page_number, text) for page_number, text in pages],
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+
+def find_pdf_files(paths):
+    """
+    The function expands directories into the PDF files they contain.
+    :param paths: File and directory paths
+    :return: A generator of PDF file paths, in a stable order.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, directories, files in os.walk(path):
+                directories.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(".pdf"):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def extract_documents(paths, workers=1, cache=None, pages_per_task=DEFAULT_PAGES_PER_TASK):
+    """
+    The function extracts the text of many PDFs, yielding one record per page in document and page
+    order as soon as it is available.
+    :param paths: The PDF files to extract
+    :param workers: The number of worker processes; 1 extracts in the calling process
+    :param cache: Optional `PageCache`; cached pages are not extracted again
+    :param pages_per_task: The number of pages handed to a worker at a time
+    :return: A generator of `{"file", "sha256", "page", "text"}` dictionaries, with zero-based pages.
+    """
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    # Each entry is a document with its cached pages and the futures of the pages still being extracted.
+    pending = deque()
+
+    def drain(limit):
+        while len(pending) > limit:
+            path, sha256, page_count, cached, tasks = pending.popleft()
+            extracted = []
+            try:
+                for page_numbers, future in tasks:
+                    pages = future.result() if executor else extract_page_range(path, page_numbers)
+                    extracted.extend(pages)
+                    cached.update(pages)
+            except Exception as err:
+                print(f"An error occurred while extracting {path}:", err, file=sys.stderr)
+                for _, future in tasks:
+                    if executor:
+                        future.cancel()
+                continue
+            if cache:
+                cache.set_pages(sha256, extracted)
+            for page_number in range(page_count):
+                yield {"file": path, "sha256": sha256, "page": page_number, "text": cached[page_number]}
+
+    try:
+        for path in paths:
+            try:
+                sha256 = file_hash(path)
+                page_count = cache.get_page_count(sha256) if cache else None
+                if page_count is None:
+                    page_count = count_pages(path)
+                    if cache:
+                        cache.set_page_count(sha256, page_count)
+            except Exception as err:
+                print(f"An error occurred while opening {path}:", err, file=sys.stderr)
+                continue
+
+            cached = cache.get_pages(sha256) if cache else {}
+            missing = [page_number for page_number in range(page_count) if page_number not in cached]
+            tasks = []
+            if executor:
+                for start in range(0, len(missing), pages_per_task):
+                    page_numbers = missing[start:start + pages_per_task]
+                    tasks.append((page_numbers, executor.submit(extract_page_range, path, page_numbers)))
+            elif missing:
+                # Without a pool the document is opened once and extracted in a single pass.
+                tasks.append((missing, None))
+            pending.append((path, sha256, page_count, cached, tasks))
+
+            # Keep a few documents in flight so the pool stays busy, without queueing the whole corpus.
+            yield from drain(max(workers, 1) * 2 if executor else 0)
+        yield from drain(0)
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract the text of PDF files page by page as JSONL.")
+    parser.add_argument("paths", nargs="+", help="PDF files or directories containing PDF files")
+    parser.add_argument("--output", help="JSONL file to write; stdout by default")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--pages-per-task", type=int, default=DEFAULT_PAGES_PER_TASK)
+    parser.add_argument("--cache", default=DEFAULT_CACHE_FILE, help="SQLite file caching extracted pages")
+    parser.add_argument("--no-cache", action="store_true", help="Extract every page again")
+    args = parser.parse_args(argv)
+
+    cache = None if args.no_cache else PageCache(args.cache)
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        records = extract_documents(find_pdf_files(args.paths), args.workers, cache, args.pages_per_task)
+        for record in records:
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if cache:
+            cache.close()
+
+
+if __name__ == "__main__":
+    main()
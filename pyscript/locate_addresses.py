@@ -1,9 +1,276 @@
+# Geocodes a file of addresses, and reverse geocodes "lat, lng" lines, with the ArcGIS provider of the
+# `geocoder` module. Queries are deduplicated, answered from an on-disk SQLite cache while it is fresh, and
+# the misses are looked up concurrently under a rate limit, with retries and exponential backoff on
+# connection errors, timeouts, 429 and 5xx responses. One JSON object per non-blank input line is written,
+# in input order. The provider is any callable, and the ArcGIS one can be pointed at a compatible server,
+# such as the local stub in benchmark_locate_addresses.py.
+# Usage: python locate_addresses.py addresses.txt --output locations.jsonl
+
+import argparse
+import json
+import random
+import re
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import geocoder
+import requests
+
+DEFAULT_CACHE_FILE = ".geocode_cache.sqlite"
+DEFAULT_TTL = 30 * 24 * 60 * 60
+LAT_LNG_PATTERN = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+RETRY_STATUS_CODES = {"Unknown", 429, 500, 502, 503, 504}
+
+
+class GeocodingError(Exception):
+    """A lookup failed in a way that may succeed when retried."""
+
+
+def parse_query(line):
+    """
+    The function turns an input line into a geocoding query.
+    :param line: An address, or a "lat, lng" pair to reverse geocode
+    :return: A `(key, kind, value)` tuple. `kind` is "forward" or "reverse", `value` is the address or a
+    `(lat, lng)` tuple, and `key` is the normalized form used to deduplicate and cache queries.
+    """
+    match = LAT_LNG_PATTERN.match(line)
+    if match:
+        lat, lng = float(match.group(1)), float(match.group(2))
+        if -90 <= lat <= 90 and -180 <= lng <= 180:
+            return f"reverse:{lat:.6f},{lng:.6f}", "reverse", (lat, lng)
+    address = " ".join(line.split())
+    return f"forward:{address.casefold()}", "forward", address
+
+
+class ArcgisProvider:
+    """
+    Looks queries up with `geocoder.arcgis`, reusing one HTTP session per thread.
+    """
+
+    def __init__(self, base_url=None, timeout=10):
+        """
+        :param base_url: Optional base URL of an ArcGIS-compatible GeocodeServer; the public ArcGIS service
+        is used by default
+        :param timeout: The timeout of every request in seconds
+        """
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def __call__(self, kind, value):
+        """
+        :return: A `{"lat", "lng", "address"}` dictionary, or None if the provider found nothing. A
+        `GeocodingError` is raised for failures worth retrying.
+        """
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        kwargs = {"session": self.local.session, "timeout": self.timeout}
+
+        if kind == "reverse":
+            if self.base_url:
+                kwargs["url"] = f"{self.base_url}/reverseGeocode"
+            result = geocoder.arcgis(list(value), method="reverse", **kwargs)
+        else:
+            if self.base_url:
+                kwargs["url"] = f"{self.base_url}/find"
+            result = geocoder.arcgis(value, **kwargs)
+
+        if result.ok:
+            return {"lat": result.lat, "lng": result.lng, "address": result.address}
+        if result.status_code in RETRY_STATUS_CODES:
+            raise GeocodingError(result.error or result.status)
+        return None
+
+
+class RateLimiter:
+    """
+    A thread-safe token bucket allowing `rate` calls per second on average, in bursts of up to `burst`.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class GeocodeCache:
+    """
+    An on-disk cache of lookup results keyed by normalized query. "Not found" results are cached too;
+    failed lookups are not. It is only used from the thread that created it.
+    """
+
+    def __init__(self, path, ttl=DEFAULT_TTL):
+        self.ttl = ttl
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS geocodes (key TEXT PRIMARY KEY, result TEXT, fetched_at REAL)"
+        )
+        self.connection.commit()
+
+    def get_many(self, keys):
+        """
+        :return: A dictionary of the keys with a fresh cached result, mapped to that result.
+        """
+        keys = list(keys)
+        found = {}
+        oldest = time.time() - self.ttl
+        # Stay below SQLite's limit on the number of query parameters.
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self.connection.execute(
+                f"SELECT key, result FROM geocodes WHERE fetched_at >= ? AND key IN ({','.join('?' * len(chunk))})",
+                [oldest] + chunk,
+            )
+            found.update((key, json.loads(result)) for key, result in rows)
+        return found
+
+    def set(self, key, result):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO geocodes VALUES (?, ?, ?)", (key, json.dumps(result), time.time())
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+
+def lookup_with_retries(provider, kind, value, rate_limiter=None, retries=3, backoff=0.5):
+    """
+    The function looks a query up, retrying with exponential backoff and jitter on `GeocodingError`.
+    :return: The provider's result. The last `GeocodingError` is raised once the retries are used up.
+    """
+    for attempt in range(retries + 1):
+        if rate_limiter:
+            rate_limiter.acquire()
+        try:
+            return provider(kind, value)
+        except GeocodingError:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+
+
+def geocode_batch(lines, provider, cache=None, workers=8, rate=10, retries=3, backoff=0.5):
+    """
+    The function geocodes many queries, looking every distinct query up at most once.
+    :param lines: Addresses or "lat, lng" pairs
+    :param provider: A callable taking `(kind, value)`, as described in `ArcgisProvider`
+    :param cache: Optional `GeocodeCache`; fresh cached results are used instead of looking them up
+    :param workers: The number of lookups in flight at once
+    :param rate: The maximum number of lookups started per second, or None for no limit
+    :param retries: The number of retries of a lookup that raised `GeocodingError`
+    :param backoff: The delay before the first retry in seconds; it doubles with every retry
+    :return: A list with one record per line, in order: the line as "query", plus "lat", "lng" and
+    "address" (None if nothing was found), or "error" if the lookup failed. Also a dictionary of counts.
+    """
+    queries = {}
+    keys = []
+    for line in lines:
+        key, kind, value = parse_query(line)
+        queries.setdefault(key, (kind, value))
+        keys.append(key)
+
+    results = cache.get_many(queries) if cache else {}
+    missing = [key for key in queries if key not in results]
+    errors = {}
+    rate_limiter = RateLimiter(rate, burst=workers) if rate else None
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(lookup_with_retries, provider, *queries[key], rate_limiter, retries, backoff): key
+            for key in missing
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except Exception as err:
+                errors[key] = str(err) or type(err).__name__
+                continue
+            # Written as results arrive, so an interrupted run keeps what it already looked up.
+            if cache:
+                cache.set(key, results[key])
+
+    records = []
+    for line, key in zip(lines, keys):
+        record = {"query": line}
+        if key in errors:
+            record["error"] = errors[key]
+        else:
+            record.update(results[key] or {"lat": None, "lng": None, "address": None})
+        records.append(record)
+
+    counts = {
+        "lines": len(keys),
+        "distinct": len(queries),
+        "cached": len(queries) - len(missing),
+        "looked_up": len(missing),
+        "failed": len(errors),
+    }
+    return records, counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Geocode addresses and reverse geocode lat/lng pairs in bulk.")
+    parser.add_argument("input", help="file with one address or 'lat, lng' pair per line, blank lines "
+                                      "skipped; '-' for stdin")
+    parser.add_argument("--output", help="JSONL file to write; stdout by default")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=10, help="maximum lookups per second; 0 for no limit")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--backoff", type=float, default=0.5, help="delay before the first retry in seconds")
+    parser.add_argument("--timeout", type=float, default=10, help="timeout of every request in seconds")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_FILE, help="SQLite file caching lookup results")
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL / 86400, help="days a cached result stays fresh")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--url", help="base URL of an ArcGIS-compatible GeocodeServer")
+    args = parser.parse_args(argv)
+
+    input_file = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    with input_file:
+        lines = [line.strip() for line in input_file if line.strip()]
+
+    cache = None if args.no_cache else GeocodeCache(args.cache, args.ttl * 86400)
+    started = time.perf_counter()
+    try:
+        records, counts = geocode_batch(lines, ArcgisProvider(args.url, args.timeout), cache, args.workers,
+                                        args.rate or None, args.retries, args.backoff)
+    finally:
+        if cache:
+            cache.close()
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for record in records:
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"{counts['lines']} lines, {counts['distinct']} distinct, {counts['cached']} cached, "
+        f"{counts['looked_up']} looked up, {counts['failed']} failed in {elapsed:.2f}s",
+        file=sys.stderr,
+    )
 
-address = "Kathmandu"
-coordinates = geocoder.arcgis(address)
-geo = geocoder.arcgis(address)
-print(geo.latlng)
 
-location = geocoder.arcgis([27.693290000000047, 85.32227000000006], method='reverse')
-print(location)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# Measures the import-time cost of decorating many functions with `log_functions`. It writes MODULES
+# throwaway modules of FUNCTIONS functions each, then imports them once with plain functions and once
+# with every function decorated, and reports the extra cost per decoration next to the cost of resolving
+# a module name without the cache. Run it from this directory: python benchmark_decoration.py
+
+import importlib
+import os
+import sys
+import tempfile
+import time
+
+import interceptor
+
+MODULES = 50
+FUNCTIONS = 200
+
+
+def write_modules(directory, prefix, decorated):
+    """
+    Writes `MODULES` modules named `<prefix>_<index>` into `directory` and returns their names.
+    """
+    names = []
+    for module_index in range(MODULES):
+        name = f"{prefix}_{module_index}"
+        lines = ["from interceptor import log_functions", ""]
+        for function_index in range(FUNCTIONS):
+            if decorated:
+                lines.append("@log_functions")
+            lines.append(f"def function_{function_index}(value):")
+            lines.append("    return value")
+            lines.append("")
+
+        with open(os.path.join(directory, f"{name}.py"), "w") as f:
+            f.write("\n".join(lines))
+        names.append(name)
+
+    return names
+
+
+def import_seconds(names):
+    """
+    Imports the given modules and returns the elapsed time in seconds.
+    """
+    importlib.invalidate_caches()
+    start = time.perf_counter()
+    for name in names:
+        importlib.import_module(name)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    decorations = MODULES * FUNCTIONS
+
+    with tempfile.TemporaryDirectory() as directory:
+        sys.path.insert(0, directory)
+        sys.dont_write_bytecode = True
+
+        plain = import_seconds(write_modules(directory, "plain", decorated=False))
+        decorated = import_seconds(write_modules(directory, "decorated", decorated=True))
+
+        module = sys.modules["decorated_0"]
+        start = time.perf_counter()
+        for _ in range(decorations):
+            interceptor._resolve_module_name(module)
+        uncached = time.perf_counter() - start
+
+    print(f"{MODULES} modules x {FUNCTIONS} functions = {decorations} decorations")
+    print(f"  import, undecorated:              {plain * 1e3:8.1f} ms")
+    print(f"  import, decorated:                {decorated * 1e3:8.1f} ms")
+    print(f"  extra cost per decoration:        {(decorated - plain) / decorations * 1e6:8.2f} us")
+    print(f"  uncached name resolution (each):  {uncached / decorations * 1e6:8.2f} us")
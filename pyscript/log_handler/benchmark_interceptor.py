@@ -0,0 +1,86 @@
+# Measures the per-call overhead that the `log_class` and `log_functions` decorators add on top of an
+# undecorated class and function: with INFO logging disabled (the common production setting), with
+# profiling on for every call or for a sample of calls, and with INFO enabled using a handler that discards
+# the records or a file handler written inline or through the queued backend.
+# Run it from this directory: python benchmark_interceptor.py
+
+import logging
+import tempfile
+import timeit
+
+from interceptor import (disable_profiling, disable_queued_logging, enable_profiling, enable_queued_logging,
+                         log_class, log_functions)
+
+CALLS = 200_000
+LOGGED_CALLS = 5_000
+
+
+class Plain:
+    def work(self, value):
+        return value + 1
+
+
+@log_class
+class Logged:
+    def work(self, value):
+        return value + 1
+
+
+def plain_work(value):
+    return value + 1
+
+
+@log_functions
+def logged_work(value):
+    return value + 1
+
+
+def per_call_ns(statement, setup_globals, calls):
+    """
+    Returns the best of five runs of `statement`, in nanoseconds per call.
+    """
+    timings = timeit.repeat(statement, globals=setup_globals, number=calls, repeat=5)
+    return min(timings) / calls * 1e9
+
+
+def run_benchmarks(label, calls=CALLS):
+    plain = Plain()
+    logged = Logged()
+    scope = {"plain": plain, "logged": logged, "plain_work": plain_work, "logged_work": logged_work}
+
+    results = {
+        "method (undecorated)": per_call_ns("plain.work(1)", scope, calls),
+        "method (log_class)": per_call_ns("logged.work(1)", scope, calls),
+        "attribute access (undecorated)": per_call_ns("plain.work", scope, calls),
+        "attribute access (log_class)": per_call_ns("logged.work", scope, calls),
+        "function (undecorated)": per_call_ns("plain_work(1)", scope, calls),
+        "function (log_functions)": per_call_ns("logged_work(1)", scope, calls),
+    }
+
+    print(f"{label}:")
+    for name, nanoseconds in results.items():
+        print(f"  {name:<32} {nanoseconds:8.1f} ns/call")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    run_benchmarks("INFO disabled")
+
+    enable_profiling()
+    run_benchmarks("INFO disabled, profiling every call")
+    enable_profiling(sample_rate=0.01)
+    run_benchmarks("INFO disabled, profiling 1% of calls")
+    disable_profiling()
+
+    logging.getLogger().handlers[:] = [logging.NullHandler()]
+    logging.getLogger().setLevel(logging.INFO)
+    run_benchmarks("INFO enabled, NullHandler", LOGGED_CALLS)
+
+    with tempfile.NamedTemporaryFile(suffix=".log") as log_file:
+        logging.getLogger().handlers[:] = [logging.FileHandler(log_file.name)]
+        run_benchmarks("INFO enabled, FileHandler inline", LOGGED_CALLS)
+
+        queue_handler = enable_queued_logging(maxsize=100_000, on_full="drop")
+        run_benchmarks("INFO enabled, FileHandler behind enable_queued_logging", LOGGED_CALLS)
+        disable_queued_logging()
+    print(f"  records dropped by the full queue: {queue_handler.dropped}")
@@ -1,7 +1,34 @@
+import atexit
 import functools
 import inspect
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import random
+import sys
+import threading
+import time
+
+
+_INTERCEPTOR_DIRECTORY = os.path.abspath(os.path.dirname(__file__))
+_module_name_cache = {}
+
+
+def _resolve_module_name(module):
+    """
+    Turns the file path of `module` into a dotted name relative to this directory.
+    """
+    module_file = module.__file__
+
+    if module_file.endswith('.pyc'):
+        module_file = module_file[:-1]
+
+    module_name = os.path.relpath(module_file, start=_INTERCEPTOR_DIRECTORY)
+    module_name = os.path.splitext(module_name)[0].replace(os.path.sep, '.')
+
+    return module_name
 
 
 def get_full_module_name(cls):
@@ -13,20 +40,259 @@ def get_full_module_name(cls):
     the module of the class and then calculates the full module name based on the file path of the
     module
     :return: The function `get_full_module_name(cls)` returns the full module name of the class `cls`.
-    """
-    module = inspect.getmodule(cls)
-    module_file = module.__file__
 
-    if module_file.endswith('.pyc'):
-        module_file = module_file[:-1]
+    The module is looked up through `cls.__module__` in `sys.modules` when possible, falling back to
+    `inspect.getmodule`, and the resolved name is cached per module object, so decorating many functions
+    of the same module only touches the file system path functions once.
+    """
+    module = sys.modules.get(getattr(cls, '__module__', None)) or inspect.getmodule(cls)
 
-    current_directory = os.path.abspath(os.path.dirname(__file__))
-    module_name = os.path.relpath(module_file, start=current_directory)
-    module_name = os.path.splitext(module_name)[0].replace(os.path.sep, '.')
+    module_name = _module_name_cache.get(module)
+    if module_name is None:
+        module_name = _module_name_cache[module] = _resolve_module_name(module)
 
     return module_name
 
 
+class LatencyHistogram:
+    """
+    A log-linear histogram of durations in nanoseconds, in the spirit of HdrHistogram.
+
+    Values are bucketed by their five most significant bits, so every recorded value, and every
+    percentile read back, is within about 6% of the true value while the histogram stays a few hundred
+    integers in size however many calls are recorded.
+    """
+
+    _SUB_BUCKETS = 16
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    @classmethod
+    def _bucket(cls, value):
+        if value < cls._SUB_BUCKETS:
+            return value
+        shift = value.bit_length() - 5
+        return (shift + 1) * cls._SUB_BUCKETS + (value >> shift) - cls._SUB_BUCKETS
+
+    @classmethod
+    def _bucket_value(cls, bucket):
+        if bucket < cls._SUB_BUCKETS:
+            return bucket
+        shift = bucket // cls._SUB_BUCKETS - 1
+        return (bucket % cls._SUB_BUCKETS + cls._SUB_BUCKETS) << shift
+
+    def record(self, value):
+        """
+        Adds one duration, in nanoseconds, to the histogram.
+        """
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, percent):
+        """
+        Returns the lower bound of the bucket holding the given percentile, clamped to the recorded min and
+        max, or None if the histogram is empty.
+        """
+        if not self.count:
+            return None
+
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(max(self._bucket_value(bucket), self.min), self.max)
+
+    def summary(self):
+        """
+        Returns the count, mean, min, max, p50, p95 and p99 of the histogram, in milliseconds.
+        """
+        def to_ms(value):
+            return None if value is None else value / 1e6
+
+        return {
+            "count": self.count,
+            "mean_ms": to_ms(self.total / self.count) if self.count else None,
+            "min_ms": to_ms(self.min),
+            "max_ms": to_ms(self.max),
+            "p50_ms": to_ms(self.percentile(50)),
+            "p95_ms": to_ms(self.percentile(95)),
+            "p99_ms": to_ms(self.percentile(99)),
+        }
+
+
+_profiling_enabled = False
+_profiling_sample_rate = 1.0
+_profiles = {}
+_profiles_lock = threading.Lock()
+
+
+def enable_profiling(sample_rate=1.0):
+    """
+    Makes every `log_class` and `log_functions` wrapper record wall time and CPU time of the calls it
+    samples into per-function histograms.
+
+    :param sample_rate: The fraction of calls that are timed, between 0 and 1.
+    """
+    global _profiling_enabled, _profiling_sample_rate
+
+    if not 0 < sample_rate <= 1:
+        raise ValueError("sample_rate must be in (0, 1]")
+
+    _profiling_sample_rate = sample_rate
+    _profiling_enabled = True
+
+
+def disable_profiling():
+    """
+    Stops recording timings. Histograms collected so far are kept until `reset_profile_stats` is called.
+    """
+    global _profiling_enabled
+    _profiling_enabled = False
+
+
+def reset_profile_stats():
+    """
+    Discards every histogram collected so far.
+    """
+    with _profiles_lock:
+        _profiles.clear()
+
+
+def _record_call(qualified_name, wall_ns, cpu_ns, failed):
+    with _profiles_lock:
+        profile = _profiles.get(qualified_name)
+        if profile is None:
+            profile = _profiles[qualified_name] = {
+                "wall": LatencyHistogram(), "cpu": LatencyHistogram(), "errors": 0,
+            }
+        profile["wall"].record(wall_ns)
+        if cpu_ns is not None:
+            profile["cpu"].record(cpu_ns)
+        if failed:
+            profile["errors"] += 1
+
+
+def get_profile_stats():
+    """
+    Returns the collected timings of every profiled function.
+
+    :return: A dict keyed by "<logger name>.<function qualname>" holding the number of `sampled_calls`,
+    the `estimated_calls` scaled by the sample rate, the number of `errors`, and `wall` and `cpu`
+    summaries from `LatencyHistogram.summary`. Coroutine functions only report wall time, since the
+    thread's CPU time across an `await` includes other tasks.
+    """
+    with _profiles_lock:
+        return {
+            name: {
+                "sampled_calls": profile["wall"].count,
+                "estimated_calls": round(profile["wall"].count / _profiling_sample_rate),
+                "errors": profile["errors"],
+                "wall": profile["wall"].summary(),
+                "cpu": profile["cpu"].summary(),
+            }
+            for name, profile in _profiles.items()
+        }
+
+
+def dump_profile_stats(file=None):
+    """
+    Writes the collected timings as JSON.
+
+    :param file: A path or a writable text file object; standard output when omitted.
+    """
+    stats = get_profile_stats()
+
+    if file is None:
+        json.dump(stats, sys.stdout, indent=2)
+    elif isinstance(file, (str, os.PathLike)):
+        with open(file, 'w') as f:
+            json.dump(stats, f, indent=2)
+    else:
+        json.dump(stats, file, indent=2)
+
+
+def _should_sample():
+    return _profiling_sample_rate >= 1 or random.random() < _profiling_sample_rate
+
+
+def _wrap_callable(func, name, logger):
+    """
+    Wraps `func` so that each call is logged to `logger` as " >> name" on entry and " << name" on exit,
+    or " << name raised ExceptionType" when it raises. The INFO level check happens per call, so nothing
+    is formatted while INFO is disabled. Coroutine functions get a coroutine wrapper, so the exit line and
+    timings cover the awaited body rather than the creation of the coroutine. While profiling is enabled,
+    sampled calls are timed into the histograms returned by `get_profile_stats`.
+    """
+    qualified_name = f"{logger.name}.{getattr(func, '__qualname__', name)}"
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            log = logger.isEnabledFor(logging.INFO)
+            profile = _profiling_enabled and _should_sample()
+            if not log and not profile:
+                return await func(*args, **kwargs)
+
+            if log:
+                logger.info(" >> %s", name)
+            start = time.perf_counter_ns()
+            try:
+                result = await func(*args, **kwargs)
+            except BaseException as exc:
+                if profile:
+                    _record_call(qualified_name, time.perf_counter_ns() - start, None, True)
+                if log:
+                    logger.info(" << %s raised %s", name, type(exc).__name__)
+                raise
+            if profile:
+                _record_call(qualified_name, time.perf_counter_ns() - start, None, False)
+            if log:
+                logger.info(" << %s", name)
+            return result
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        log = logger.isEnabledFor(logging.INFO)
+        profile = _profiling_enabled and _should_sample()
+        if not log and not profile:
+            return func(*args, **kwargs)
+
+        if log:
+            logger.info(" >> %s", name)
+        start = time.perf_counter_ns()
+        cpu_start = time.thread_time_ns()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as exc:
+            if profile:
+                _record_call(qualified_name, time.perf_counter_ns() - start,
+                             time.thread_time_ns() - cpu_start, True)
+            if log:
+                logger.info(" << %s raised %s", name, type(exc).__name__)
+            raise
+        if profile:
+            _record_call(qualified_name, time.perf_counter_ns() - start, time.thread_time_ns() - cpu_start, False)
+        if log:
+            logger.info(" << %s", name)
+        return result
+
+    return wrapper
+
+
 def log_class(cls):
     """
     The `log_class` function is a Python decorator that logs method calls within a class.
@@ -35,22 +301,32 @@ def log_class(cls):
     with logging functionality. The function adds logging before and after each method call in the class
     :return: The `log_methods` function returns a decorated class that logs information before and after
     each method call.
+
+    The public methods, static methods and class methods of `cls` and its bases are wrapped once, when
+    the class is decorated, and the logger is resolved at the same time, so attribute access costs the
+    same as on an undecorated class. Callables assigned to instances at runtime are not logged.
     """
     module_name = get_full_module_name(cls)
+    logger = logging.getLogger(module_name)
+    wrapped = {}
 
-    class DecoratedClass(cls):
-        def __getattribute__(self, name):
-            attr = super().__getattribute__(name)
-            if callable(attr) and not name.startswith('_'):
-                @functools.wraps(attr)
-                def wrapper(*args, **kwargs):
-                    logger = logging.getLogger(module_name)
-                    logger.info(f" >> {name}")
-                    result = attr(*args, **kwargs)
-                    logger.info(f" << {name}")
-                    return result
-                return wrapper
-            return attr
+    for klass in reversed(cls.__mro__[:-1]):
+        for name, attr in vars(klass).items():
+            if name.startswith('_'):
+                continue
+            if isinstance(attr, staticmethod):
+                wrapped[name] = staticmethod(_wrap_callable(attr.__func__, name, logger))
+            elif isinstance(attr, classmethod):
+                wrapped[name] = classmethod(_wrap_callable(attr.__func__, name, logger))
+            elif inspect.isfunction(attr):
+                wrapped[name] = _wrap_callable(attr, name, logger)
+            else:
+                wrapped.pop(name, None)
+
+    DecoratedClass = type(cls.__name__, (cls,), wrapped)
+    DecoratedClass.__qualname__ = cls.__qualname__
+    DecoratedClass.__module__ = cls.__module__
+    DecoratedClass.__doc__ = cls.__doc__
     return DecoratedClass
 
 
@@ -67,12 +343,112 @@ def log_functions(func):
     """
     module_name = get_full_module_name(func)
 
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        logger = logging.getLogger(module_name)
-        logger.info(f" >> {func.__name__}")
-        result = func(*args, **kwargs)
-        logger.info(f" << {func.__name__}")
-        return result
+    return _wrap_callable(func, func.__name__, logging.getLogger(module_name))
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    A `QueueHandler` that enqueues records unformatted and applies a policy when the queue is full.
+
+    :param queue: A bounded `queue.Queue` shared with a `QueueListener`.
+    :param on_full: What to do with a record when the queue is full: "drop" discards it, "block" waits
+    for room, and "sample" waits for room for one record in every `sample_every` and discards the rest.
+    :param sample_every: The sampling interval used by the "sample" policy.
+    """
+
+    def __init__(self, queue, on_full="drop", sample_every=100):
+        if on_full not in ("drop", "block", "sample"):
+            raise ValueError(f"Unsupported on_full policy: {on_full}")
+
+        super().__init__(queue)
+        self.on_full = on_full
+        self.sample_every = sample_every
+        self.dropped = 0
+        self._overflowed = 0
+
+    def prepare(self, record):
+        """
+        Returns the record untouched so that formatting happens on the listener thread. Records are
+        only ever consumed in-process, so they do not need to be made picklable.
+        """
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        if self.on_full == "sample":
+            self._overflowed += 1
+            if self._overflowed % self.sample_every == 0:
+                self.queue.put(record)
+                return
+        elif self.on_full == "block":
+            self.queue.put(record)
+            return
+
+        self.dropped += 1
+
+
+class _BlockingSentinelQueueListener(logging.handlers.QueueListener):
+    """
+    A `QueueListener` that waits for room to enqueue its stop sentinel instead of failing on a full queue.
+    """
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+_queue_listener = None
+_queued_logger = None
+_queued_logger_handlers = None
+
+
+def enable_queued_logging(logger=None, maxsize=10000, on_full="drop", sample_every=100):
+    """
+    Moves the handlers of `logger` behind a bounded queue served by a background `QueueListener` thread,
+    so that the `log_class` and `log_functions` wrappers only pay for an enqueue.
+
+    :param logger: The logger whose handlers are moved behind the queue, the root logger by default.
+    :param maxsize: The maximum number of records waiting in the queue.
+    :param on_full: The policy applied when the queue is full, see `BoundedQueueHandler`.
+    :param sample_every: The sampling interval used by the "sample" policy.
+    :return: The installed `BoundedQueueHandler`; its `dropped` attribute counts discarded records.
+    """
+    global _queue_listener, _queued_logger, _queued_logger_handlers
+
+    if _queue_listener is not None:
+        disable_queued_logging()
+
+    logger = logger or logging.getLogger()
+    record_queue = queue.Queue(maxsize)
+    queue_handler = BoundedQueueHandler(record_queue, on_full, sample_every)
+
+    _queued_logger = logger
+    _queued_logger_handlers = list(logger.handlers)
+    _queue_listener = _BlockingSentinelQueueListener(record_queue, *_queued_logger_handlers,
+                                                     respect_handler_level=True)
+    logger.handlers = [queue_handler]
+    _queue_listener.start()
+
+    return queue_handler
+
+
+def disable_queued_logging():
+    """
+    Flushes the queue, stops the listener thread and gives the logger back its original handlers.
+    This is registered with `atexit`, so records still queued at interpreter exit are written.
+    """
+    global _queue_listener, _queued_logger, _queued_logger_handlers
+
+    if _queue_listener is None:
+        return
+
+    _queued_logger.handlers = _queued_logger_handlers
+    _queue_listener.stop()
+    _queue_listener = _queued_logger = _queued_logger_handlers = None
+
 
-    return wrapper
\ No newline at end of file
+atexit.register(disable_queued_logging)
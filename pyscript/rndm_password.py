@@ -1,46 +1,158 @@
-import random 
+import argparse
+import os
+import secrets
 import string
+import sys
+from functools import lru_cache
 
 word_length = 18
 
-components = [string.ascii_letters, string.digits, "!@#$%&"]
+symbols = "!@#$%&"
 
-chars = []
-for clist in components:
-    for item in clist:
-        chars.append(item)
-def generate_password():
+components = [string.ascii_letters, string.digits, symbols]
+
+chars = "".join(components)
+
+# Minimum number of characters each class must contribute to a password.
+default_policy = {string.digits: 1, symbols: 1}
+
+batch_size = 10_000
+
+
+@lru_cache(maxsize=64)
+def _sampling_table(alphabet):
     """
-    The function generates a random password of a specified length using a given set of characters.
-    :return: a randomly generated password as a string.
+    The function builds the `bytes.translate` arguments that turn random bytes into alphabet characters,
+    or into any other set of byte values when `alphabet` is given as bytes.
+    :return: The translation table mapping each byte to `alphabet[byte % len(alphabet)]`, the bytes to
+    delete, and the number of bytes kept. Bytes at or above the largest multiple of the alphabet size are
+    rejected, so every character is equally likely.
     """
-    passoword = []
-    for i in range(word_length):
-        rchar = random.choice(chars)
-        passoword.append(rchar)
-    return "".join(passoword)
-print(generate_password())
+    encoded = alphabet if isinstance(alphabet, bytes) else alphabet.encode("ascii")
+    size = len(encoded)
+    limit = 256 - 256 % size
+    table = bytes(encoded[byte % size] for byte in range(256))
+    return table, bytes(range(limit, 256)), limit
 
 
+def _sample(alphabet, count):
+    """
+    The function draws `count` characters uniformly from the alphabet with the operating system's CSPRNG.
+    Random bytes are drawn in large blocks, and rejection and mapping happen in a single `bytes.translate`
+    call per block instead of a Python call per character.
+    :return: The sampled characters as ASCII bytes.
+    """
+    table, rejected, limit = _sampling_table(alphabet)
+    sampled = bytearray()
+    while len(sampled) < count:
+        needed = count - len(sampled)
+        # Ask for enough bytes that, after rejection, one block is almost always sufficient.
+        sampled += os.urandom(needed * 256 // limit + 64).translate(table, rejected)
+    del sampled[count:]
+    return sampled
 
-#simplified version
-import random
-import string
 
-word_length = 18
+def _validate(length, alphabet, policy):
+    if length < 1:
+        raise ValueError("length must be at least 1")
+    if not alphabet or len(set(alphabet)) != len(alphabet):
+        raise ValueError("alphabet must be non-empty and must not repeat characters")
+    if not alphabet.isascii():
+        raise ValueError("alphabet must only contain ASCII characters")
+    for character_class, minimum in policy.items():
+        if minimum < 0 or not character_class or not set(character_class) <= set(alphabet):
+            raise ValueError(f"invalid policy entry {character_class!r}: {minimum}")
+    if sum(policy.values()) > length:
+        raise ValueError("the policy requires more characters than the password length")
 
-components = [string.ascii_letters, string.digits, '!@#$%&']
 
-chars = [char for clist in components for char in clist]
+def generate_passwords(n, length=word_length, alphabet=chars, policy=None):
+    """
+    The function generates passwords with a cryptographically secure random number generator.
+    :param n: The number of passwords to generate
+    :param length: The length of every password
+    :param alphabet: The characters passwords are drawn from; ASCII only, without repeats
+    :param policy: A dictionary mapping a class of characters (a string of alphabet characters) to the
+    minimum number of characters of that class every password must contain. Defaults to `default_policy`
+    when the default alphabet is used, and to no policy otherwise.
+    :return: A list of `n` passwords as strings. The required characters are drawn from their class and
+    placed at random positions among characters drawn from the whole alphabet, so the policy holds
+    without regenerating passwords that miss it.
+    """
+    if policy is None:
+        policy = default_policy if alphabet == chars else {}
+    _validate(length, alphabet, policy)
+    if n <= 0:
+        return []
+
+    free_length = length - sum(policy.values())
+    free = _sample(alphabet, n * free_length)
+    # One column of n characters per required character, each paired with the n positions it is inserted
+    # at. The j-th insertion goes into a password of free_length + j characters, so its positions are drawn
+    # uniformly from 0..free_length + j the same way characters are, in one block per column.
+    required = []
+    for character_class, minimum in policy.items():
+        for _ in range(minimum):
+            slots = free_length + len(required) + 1
+            positions = _sample(bytes(range(slots)), n) if slots <= 256 else None
+            required.append((_sample(character_class, n), positions))
+
+    passwords = []
+    for index in range(n):
+        password = free[index * free_length:(index + 1) * free_length]
+        for characters, positions in required:
+            position = positions[index] if positions else secrets.randbelow(len(password) + 1)
+            password.insert(position, characters[index])
+        passwords.append(password.decode("ascii"))
+    return passwords
+
 
 def generate_password():
     """
     The function generates a random password of a specified length using a given set of characters.
-    :return: The function `generate_password()` is returning a randomly generated password as a string.
-    The password is generated using the `random.choices()` function, which selects characters randomly
-    from the `chars` list with a length of `word_length`. The selected characters are then joined
-    together using the `join()` method and returned as a string.
-    """
-    password = random.choices(chars, k=word_length)
-    return ''.join(password)
-print(generate_password())
\ No newline at end of file
+    :return: a randomly generated password as a string.
+    """
+    return generate_passwords(1)[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate random passwords with a CSPRNG, one per line.")
+    parser.add_argument("-n", "--count", type=int, default=1, help="number of passwords to generate")
+    parser.add_argument("--length", type=int, default=word_length)
+    parser.add_argument("--alphabet", default=chars, help="characters to draw from")
+    parser.add_argument("--min-digits", type=int, help="default: 1 if the alphabet has digits")
+    parser.add_argument("--min-symbols", type=int,
+                        help=f"minimum number of characters from {symbols}; default: 1 if the alphabet has any")
+    parser.add_argument("--min-lowercase", type=int, default=0)
+    parser.add_argument("--min-uppercase", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    classes = {
+        "digits": (string.digits, args.min_digits),
+        "symbols": (symbols, args.min_symbols),
+        "lowercase": (string.ascii_lowercase, args.min_lowercase),
+        "uppercase": (string.ascii_uppercase, args.min_uppercase),
+    }
+    policy = {}
+    for name, (character_class, minimum) in classes.items():
+        # A class is restricted to the characters of the alphabet that belong to it.
+        available = "".join(character for character in character_class if character in args.alphabet)
+        if minimum is None:
+            # Like the default policy, but only for the classes the alphabet has.
+            minimum = 1 if available else 0
+        elif minimum and not available:
+            parser.error(f"--min-{name} requires {name} in the alphabet")
+        if minimum:
+            policy[available] = minimum
+
+    try:
+        # Written a batch at a time, so large runs are streamed instead of held in memory.
+        for start in range(0, args.count, batch_size):
+            passwords = generate_passwords(min(batch_size, args.count - start), args.length, args.alphabet, policy)
+            sys.stdout.write("\n".join(passwords) + "\n")
+    except ValueError as err:
+        parser.error(str(err))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from validate_sql_query_using_regex import SelectQueryValidator, classify_statements, is_select_query
+
+BYPASSES = [
+    # MySQL executes the body of /*! */ comments.
+    "SELECT 1 /*!50000 ; DROP TABLE x */",
+    "SELECT 1 /*M! ; DROP TABLE x */",
+    # $a$ is an identifier in MySQL, not a dollar-quoted string.
+    "SELECT $a$ FROM t; DROP TABLE x; SELECT $a$",
+    # '#' starts a comment only in MySQL.
+    "SELECT 1 # 2; DROP TABLE x",
+    # With NO_BACKSLASH_ESCAPES, '\' is a complete string.
+    "SELECT '\\'; DROP TABLE x; --'",
+    # '--' only starts a comment when followed by whitespace.
+    "SELECT 1 --1; DROP TABLE x",
+]
+
+SELECTS = [
+    "SELECT id FROM users",
+    "  with recent as (select * from t) select * from recent  ",
+    "SELECT id FROM users -- DROP the old rows later\n",
+    "SELECT id FROM users /* DELETE; */ WHERE name = 'a;b'",
+    "SELECT 'it''s; DROP' FROM t",
+    "SELECT \"x\" FROM t WHERE a = 'c:\\\\dir'",
+    "SELECT /*+ MAX_EXECUTION_TIME(1000) */ id FROM t",
+]
+
+
+@pytest.mark.parametrize("query", BYPASSES)
+def test_hidden_writes_are_rejected(query):
+    assert not is_select_query(query)
+    assert not SelectQueryValidator(cache_size=0).is_select(query)
+    assert classify_statements(query) != ["select"]
+
+
+@pytest.mark.parametrize("query", SELECTS)
+def test_selects_are_accepted(query):
+    assert is_select_query(query)
+
+
+def test_optimizer_hints_are_scanned():
+    assert not is_select_query("SELECT /*+ ; DELETE FROM t */ 1")
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT 1 /* DROP TABLE x",
+    "SELECT 'a; DROP TABLE x",
+    "SELECT 'a\\",
+    "SELECT `a; DROP TABLE x",
+])
+def test_unterminated_queries_are_rejected(query):
+    assert classify_statements(query) == ["unterminated"]
+    assert not is_select_query(query)
+
+
+def test_pathological_input_is_linear():
+    # Quadratic scanning took seconds on inputs 10 times smaller than these.
+    queries = ["SELECT 1 " + "/* " * 200_000, "SELECT " + "'" * 600_001, "SELECT '" + "\\'" * 300_000]
+    start = time.perf_counter()
+    for query in queries:
+        assert not is_select_query(query)
+    assert time.perf_counter() - start < 2
@@ -1,13 +1,187 @@
+import functools
 import re
+import string
+
+# MySQL lexing: "--" only starts a comment when followed by whitespace, and /*! */, /*M! */ and /*+ */
+# comments are left in place because the server executes or parses their body. An unterminated comment
+# or literal runs to the end of the query and is captured by a group, so every match succeeds on its
+# first attempt and masking stays linear.
+SQL_OPAQUE_PATTERN = re.compile(r"""
+    --(?=\s|$)[^\n]*|\#[^\n]*|/\*(?![!+]|M!)(?:.*?\*/|(.*)\Z)
+  | '(?:[^'\\]|\\.|'')*(?:'|(\\?)\Z)|"(?:[^"\\]|\\.|"")*(?:"|(\\?)\Z)|`(?:[^`]|``)*(?:`|()\Z)
+""", re.VERBOSE | re.DOTALL)
+# The same without backslash escapes (sql_mode NO_BACKSLASH_ESCAPES) and without "#" comments, which are
+# MySQL-only. A query using either is only accepted if it classifies the same way under both readings.
+SQL_STRICT_OPAQUE_PATTERN = re.compile(r"""
+    --(?=\s|$)[^\n]*|/\*(?![!+]|M!)(?:.*?\*/|(.*)\Z)
+  | '(?:[^']|'')*(?:'|()\Z)|"(?:[^"]|"")*(?:"|()\Z)|`(?:[^`]|``)*(?:`|()\Z)
+""", re.VERBOSE | re.DOTALL)
+# Stands in for an unterminated comment or literal in masked text.
+UNTERMINATED_MARK = '\0'
+FORBIDDEN_KEYWORDS = frozenset({'DROP', 'DELETE', 'INSERT', 'UPDATE', 'ALTER', 'CREATE', 'TRUNCATE'})
+WORD_SEPARATORS = str.maketrans({char: ' ' for char in string.punctuation if char not in '_$'})
+LEADING_KEYWORD_PATTERN = re.compile(r'[\s(]*([A-Za-z_][\w$]*)?')
+SELECT_LEADING_KEYWORDS = frozenset({'SELECT', 'WITH'})
+
+
+def mask_sql(query, strict=False):
+    """
+    Blanks out the comments, string literals and quoted identifiers of a query in one left-to-right pass.
+
+    The query is lexed as MySQL. Comments (``-- ``, ``#`` and ``/* */``) become a space and literals
+    (quoted strings and quoted identifiers) become ``?``, so keywords and semicolons inside them disappear.
+    Executable ``/*! */`` and ``/*M! */`` comments and ``/*+ */`` optimizer hints are kept as SQL. An
+    unterminated quote or comment runs to the end of the query and becomes ``UNTERMINATED_MARK``.
+
+    Args:
+        query (str): The SQL text.
+        strict (bool): Treat backslashes in literals as ordinary characters and ``#`` as SQL, as with
+            sql_mode NO_BACKSLASH_ESCAPES or a non-MySQL server.
+
+    Returns:
+        str: The masked SQL text.
+    """
+    pattern = SQL_STRICT_OPAQUE_PATTERN if strict else SQL_OPAQUE_PATTERN
+    return pattern.sub(_mask_replacement, query)
+
+
+def _mask_replacement(match):
+    if match.lastindex:
+        return UNTERMINATED_MARK
+    return ' ' if match.group().startswith(('--', '#', '/*')) else ' ? '
+
+
+def classify_statements(query):
+    """
+    Classifies every statement of a query.
+
+    The query is masked with ``mask_sql`` and split on the semicolons that remain, which are exactly the
+    statement boundaries. Each statement is then split into words with ``str.translate`` and checked
+    against keyword sets, so the work stays linear in the length of the query and runs mostly in C.
+    A query containing a backslash or ``#`` is also masked with ``strict=True``, since where its
+    literals and comments end depends on the server's sql_mode or dialect. A query with an unterminated
+    quote or comment under either reading (or a NUL character) is not classified further.
+
+    Args:
+        query (str): The SQL text, possibly holding several ``;``-separated statements.
+
+    Returns:
+        list: One entry per non-empty statement: "write" if it uses a forbidden keyword such as DROP or
+            UPDATE, "select" if it starts with SELECT or WITH (after any opening parentheses) and contains
+            SELECT, and "other" otherwise. If the two readings of a query classify differently, the
+            result is ``['ambiguous']``, and if either is unterminated it is ``['unterminated']``.
+    """
+    masked_query = mask_sql(query)
+    if UNTERMINATED_MARK in masked_query:
+        return ['unterminated']
+
+    kinds = _classify_masked(masked_query)
+    if '\\' in query or '#' in query:
+        strict_masked_query = mask_sql(query, strict=True)
+        if UNTERMINATED_MARK in strict_masked_query:
+            return ['unterminated']
+        if _classify_masked(strict_masked_query) != kinds:
+            return ['ambiguous']
+    return kinds
+
+
+def _classify_masked(masked_query):
+    kinds = []
+
+    for statement in masked_query.split(';'):
+        if not statement or statement.isspace():
+            continue
+
+        words = frozenset(statement.upper().translate(WORD_SEPARATORS).split())
+        if not FORBIDDEN_KEYWORDS.isdisjoint(words):
+            kinds.append('write')
+            continue
+
+        leading_keyword = LEADING_KEYWORD_PATTERN.match(statement).group(1)
+        if leading_keyword and leading_keyword.upper() in SELECT_LEADING_KEYWORDS and 'SELECT' in words:
+            kinds.append('select')
+        else:
+            kinds.append('other')
+
+    return kinds
+
+
+class SelectQueryValidator:
+    """
+    Checks whether queries are valid SELECT statements, using a quote- and comment-aware classifier
+    and a result cache.
+
+    A query is accepted when it holds exactly one statement and ``classify_statements`` classifies it as
+    "select". The verdict for each query, with surrounding whitespace stripped, is kept in a bounded LRU
+    cache, so repeated queries only cost a dictionary lookup. Inner whitespace is left alone, since
+    collapsing newlines would change where ``--`` comments end.
+
+    Args:
+        cache_size (int): The maximum number of normalized queries whose verdict is cached. 0 disables
+            the cache.
+    """
+
+    def __init__(self, cache_size=4096):
+        self._classify = functools.lru_cache(maxsize=cache_size)(self._classify_normalized)
+
+    @staticmethod
+    def normalize(query):
+        """
+        Strips leading and trailing whitespace, giving the key the result cache is looked up by.
+        """
+        return query.strip()
+
+    @staticmethod
+    def _classify_normalized(query):
+        return classify_statements(query) == ['select']
+
+    def is_select(self, query):
+        """
+        Check if the given query is a valid SELECT statement.
+
+        Args:
+            query (str): The SQL query to be checked.
+
+        Returns:
+            bool: True if the query is a valid SELECT statement, False otherwise.
+        """
+        return self._classify(self.normalize(query))
+
+    def validate_many(self, queries):
+        """
+        Check a batch of queries.
+
+        Args:
+            queries (iterable): The SQL queries to be checked.
+
+        Returns:
+            list: One bool per query, True where the query is a valid SELECT statement.
+        """
+        classify = self._classify
+        normalize = self.normalize
+        return [classify(normalize(query)) for query in queries]
+
+    def cache_info(self):
+        """
+        Returns the hits, misses, maxsize and current size of the result cache.
+        """
+        return self._classify.cache_info()
+
+
+_default_validator = SelectQueryValidator()
+
 
 def is_select_query(query):
     """
     Check if the given query is a valid SELECT statement.
 
-    This function checks if the provided query is a SELECT statement by matching
-    against regular expressions for SELECT and forbidden SQL commands such as
-    DROP, DELETE, INSERT, UPDATE, ALTER, CREATE, and TRUNCATE. It simplifies the
-    query text by removing extra whitespace before performing the match.
+    This function checks if the provided query is a single SELECT statement.
+    String literals and comments are masked first, so keywords and semicolons
+    inside them are ignored; text whose role depends on the server's sql_mode
+    or dialect must read as a single SELECT either way. The
+    query is rejected if it holds more than one statement, does not start with
+    SELECT or WITH, or uses a forbidden SQL command such as DROP, DELETE, INSERT,
+    UPDATE, ALTER, CREATE, or TRUNCATE.
 
     Args:
         query (str): The SQL query to be checked.
@@ -15,10 +189,4 @@ def is_select_query(query):
     Returns:
         bool: True if the query is a valid SELECT statement, False otherwise.
     """
-    forbidden_pattern = r'\b(DROP|DELETE|INSERT|UPDATE|ALTER|CREATE|TRUNCATE)\b'
-    select_pattern = r'\bSELECT\b'
-    query_simplified = re.sub(r'\s+', ' ', query.strip())
-    
-    if re.search(forbidden_pattern, query_simplified, re.IGNORECASE):
-        return False
-    return bool(re.search(select_pattern, query_simplified, re.IGNORECASE))
\ No newline at end of file
+    return _default_validator.is_select(query)